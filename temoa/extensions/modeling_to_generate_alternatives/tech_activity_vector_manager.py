@@ -259,7 +259,7 @@ class TechActivityVectorManager(VectorManager):
         # verify a unit vector
         err = abs(abs(sum(coeffs)) - 1)
         assert err < 1e-6, 'unit vector size error'
-        expr = sum(c * v for v, c in zip(vars, coeffs) if c != 0)
+        expr = quicksum(c * v for v, c in zip(vars, coeffs) if c != 0)
         return expr
 
     def _next_objective_vector(self, M: TemoaModel) -> Expression | None:
@@ -33,7 +33,7 @@ import sqlite3
 import sys
 from collections.abc import Iterable
 
-from pyomo.core import value, Constraint, Expression, Objective
+from pyomo.core import value, Constraint, Expression, Objective, quicksum
 from pyomo.dataportal import DataPortal
 from pyomo.opt import check_optimal_termination
 
@@ -246,6 +246,10 @@ class SvMgaSequencer:
             print(msg)
 
         # handle emissions...
+        # snapshot the flow indices once, rather than asking the Vars for each expanded index
+        if emission_labels:
+            flow_keys = set(M.V_FlowOut)
+            annual_flow_keys = set(M.V_FlowOutAnnual)
         for label in emission_labels:
             idxs = [idx for idx in M.EmissionActivity if idx[1] == label]
             logger.debug('Located %d items for emission label: %s', len(idxs), label)
@@ -254,16 +258,16 @@ class SvMgaSequencer:
                 # flows and the annual flows.  And, we need to sum across the "expanded" index
                 # for both which includes period, season, tod or just period respectively
                 expanded_idxs, expanded_annual_idxs = SvMgaSequencer.flow_idxs_from_eac_idx(M, idx)
-                element = sum(
+                element = quicksum(
                     M.V_FlowOut[flow_idx] * M.EmissionActivity[idx]
                     for flow_idx in expanded_idxs
-                    if flow_idx in M.V_FlowOut
+                    if flow_idx in flow_keys
                 )
                 expr += element
-                annual_element = sum(
+                annual_element = quicksum(
                     M.V_FlowOutAnnual[annual_flow_idx] * M.EmissionActivity[idx]
                     for annual_flow_idx in expanded_annual_idxs
-                    if annual_flow_idx in M.V_FlowOutAnnual
+                    if annual_flow_idx in annual_flow_keys
                 )
                 expr += annual_element
 
@@ -271,12 +275,12 @@ class SvMgaSequencer:
         for label in activity_labels:
             idxs = [idx for idx in M.V_FlowOut if idx[5] == label]
             logger.debug('Located %d items for activity label: %s', len(idxs), label)
-            expr += sum(M.V_FlowOut[idx] for idx in idxs)
+            expr += quicksum(M.V_FlowOut[idx] for idx in idxs)
 
         # handle capacity...
         for label in capacity_labels:
             idxs = [idx for idx in M.V_Capacity if idx[2] == label]
             logger.debug('Located %d items for capacity label: %s', len(idxs), label)
-            expr += sum(M.V_Capacity[idx] for idx in idxs)
+            expr += quicksum(M.V_Capacity[idx] for idx in idxs)
 
         return expr
@@ -18,7 +18,7 @@ A complete copy of the GNU General Public License v2 (GPLv2) is available
 in LICENSE.txt.  Users uncompressing this from an archive may not have
 received this license file.  If not, see <http://www.gnu.org/licenses/>.
 """
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from itertools import product as cross_product, product
 from operator import itemgetter as iget
 from sys import stderr as SE
@@ -38,6 +38,9 @@ from logging import getLogger
 
 logger = getLogger(__name__)
 
+ExchangeLink = namedtuple('ExchangeLink', ['exporter', 'importer'])
+"""the (exporting, importing) regions of an exchange region name 'r_i-r_j'"""
+
 
 # ---------------------------------------------------------------
 # Validation and initialization routines.
@@ -567,12 +570,17 @@ def CreateSparseDicts(M: 'TemoaModel'):
     l_first_period = min(M.time_future)
     l_exist_indices = M.ExistingCapacity.sparse_keys()
     l_used_techs = set()
+    # the split param keys as sets, a membership test on sparse_iterkeys() walks the whole param
+    l_input_split = set(M.TechInputSplit.sparse_iterkeys())
+    l_input_split_average = set(M.TechInputSplitAverage.sparse_iterkeys())
+    l_output_split = set(M.TechOutputSplit.sparse_iterkeys())
 
     # The basis for the dictionaries are the sparse keys defined in the
     # Efficiency table.
     logger.debug(
         'Starting creation of SparseDicts with Efficiency table size: %d', len(M.Efficiency)
     )
+    M._exchange_links = dict()
     for r, i, t, v, o in M.Efficiency.sparse_iterkeys():
         if '-' in r and t not in M.tech_exchange:
             msg = (
@@ -581,6 +589,9 @@ def CreateSparseDicts(M: 'TemoaModel'):
             )
             logger.error(msg)
             raise ValueError(msg)
+        if t in M.tech_exchange and r not in M._exchange_links:
+            r_e, _, r_i = r.partition('-')
+            M._exchange_links[r] = ExchangeLink(r_e, r_i)
         l_process = (r, t, v)
         l_lifetime = value(M.LifetimeProcess[l_process])
         # Do some error checking for the user.
@@ -678,38 +689,30 @@ def CreateSparseDicts(M: 'TemoaModel'):
                 M.storageVintages[r, p, t] = set()
             if t in M.tech_ramping and (r, p, t) not in M.rampVintages:
                 M.rampVintages[r, p, t] = set()
-            if (r, p, i, t) in M.TechInputSplit.sparse_iterkeys() and (
-                r,
-                p,
-                i,
-                t,
-            ) not in M.inputsplitVintages:
+            if (r, p, i, t) in l_input_split and (r, p, i, t) not in M.inputsplitVintages:
                 M.inputsplitVintages[r, p, i, t] = set()
-            if (r, p, i, t) in M.TechInputSplitAverage.sparse_iterkeys() and (
+            if (r, p, i, t) in l_input_split_average and (
                 r,
                 p,
                 i,
                 t,
             ) not in M.inputsplitaverageVintages:
                 M.inputsplitaverageVintages[r, p, i, t] = set()
-            if (r, p, t, o) in M.TechOutputSplit.sparse_iterkeys() and (
-                r,
-                p,
-                t,
-                o,
-            ) not in M.outputsplitVintages:
+            if (r, p, t, o) in l_output_split and (r, p, t, o) not in M.outputsplitVintages:
                 M.outputsplitVintages[r, p, t, o] = set()
             if t in M.tech_resource and (r, p, o) not in M.ProcessByPeriodAndOutput:
                 M.ProcessByPeriodAndOutput[r, p, o] = set()
             if t in M.tech_reserve and (r, p) not in M.processReservePeriods:
                 M.processReservePeriods[r, p] = set()
 
-            # since t is in M.tech_exchange, r here has *-* format (e.g. 'US-Mexico').  # r[
-            # :r.find("-")] extracts the region index before the "-".
-            if t in M.tech_exchange and (r[: r.find('-')], p, i) not in M.exportRegions:
-                M.exportRegions[r[: r.find('-')], p, i] = set()
-            if t in M.tech_exchange and (r[r.find('-') + 1 :], p, o) not in M.importRegions:
-                M.importRegions[r[r.find('-') + 1 :], p, o] = set()
+            # since t is in M.tech_exchange, r here has *-* format (e.g. 'US-Mexico'), already
+            # split into its exporting and importing regions in M._exchange_links
+            if t in M.tech_exchange:
+                link = M._exchange_links[r]
+                if (link.exporter, p, i) not in M.exportRegions:
+                    M.exportRegions[link.exporter, p, i] = set()
+                if (link.importer, p, o) not in M.importRegions:
+                    M.importRegions[link.importer, p, o] = set()
 
             # Now that all of the keys have been defined, and values initialized
             # to empty sets, we fill in the appropriate values for each
@@ -730,24 +733,23 @@ def CreateSparseDicts(M: 'TemoaModel'):
                 M.storageVintages[r, p, t].add(v)
             if t in M.tech_ramping:
                 M.rampVintages[r, p, t].add(v)
-            if (r, p, i, t) in M.TechInputSplit.sparse_iterkeys():
+            if (r, p, i, t) in l_input_split:
                 M.inputsplitVintages[r, p, i, t].add(v)
-            if (r, p, i, t) in M.TechInputSplitAverage.sparse_iterkeys():
+            if (r, p, i, t) in l_input_split_average:
                 M.inputsplitaverageVintages[r, p, i, t].add(v)
-            if (r, p, t, o) in M.TechOutputSplit.sparse_iterkeys():
+            if (r, p, t, o) in l_output_split:
                 M.outputsplitVintages[r, p, t, o].add(v)
             if t in M.tech_resource:
                 M.ProcessByPeriodAndOutput[r, p, o].add((i, t, v))
             if t in M.tech_reserve:
                 M.processReservePeriods[r, p].add((t, v))
             if t in M.tech_exchange:
-                M.exportRegions[r[: r.find('-')], p, i].add((r[r.find('-') + 1 :], t, v, o))
-            if t in M.tech_exchange:
-                M.importRegions[r[r.find('-') + 1 :], p, o].add((r[: r.find('-')], t, v, i))
+                M.exportRegions[link.exporter, p, i].add((link.importer, t, v, o))
+                M.importRegions[link.importer, p, o].add((link.exporter, t, v, i))
 
     for r, i, t, v, o in M.Efficiency.sparse_iterkeys():
         if t in M.tech_exchange:
-            reg = r.split('-')[0]
+            reg = M._exchange_links[r].exporter
             for r1, i1, t1, v1, o1 in M.Efficiency.sparse_iterkeys():
                 if (r1 == reg) & (o1 == i):
                     for p in M.time_optimize:
@@ -777,13 +779,80 @@ def CreateSparseDicts(M: 'TemoaModel'):
         for i in sorted(l_unused_techs):
             SE.write(msg.format(i))
 
+    # split the upstream processes of each commodity by their annual / timeslice resolution
+    M.commodityUStreamProcessAnnual = {
+        k: tuple((t, v) for t, v in processes if t in M.tech_annual)
+        for k, processes in M.commodityUStreamProcess.items()
+    }
+    M.commodityUStreamProcessNonAnnual = {
+        k: tuple((t, v) for t, v in processes if t not in M.tech_annual)
+        for k, processes in M.commodityUStreamProcess.items()
+    }
+
+    # split the downstream processes of each commodity by storage / annual resolution.  The
+    # commodity balances divide the flows by the efficiency, so it is resolved (as a reciprocal)
+    # once per (t, v, o) here instead of once per constraint.
+    M.commodityDStreamStorage = dict()
+    M.commodityDStreamNonAnnual = dict()
+    M.commodityDStreamAnnual = dict()
+    for (r, p, c), processes in M.commodityDStreamProcess.items():
+        storage, non_annual, annual = [], [], []
+        for t, v in sorted(processes):
+            for o in M.ProcessOutputsByInput[r, p, t, v, c]:
+                inv_eff = 1 / value(M.Efficiency[r, c, t, v, o])
+                if t in M.tech_storage:
+                    storage.append((t, v, o, inv_eff))
+                elif t in M.tech_annual:
+                    annual.append((t, v, o, inv_eff))
+                else:
+                    non_annual.append((t, v, o, inv_eff))
+        M.commodityDStreamStorage[r, p, c] = tuple(storage)
+        M.commodityDStreamNonAnnual[r, p, c] = tuple(non_annual)
+        M.commodityDStreamAnnual[r, p, c] = tuple(annual)
+
+    # the same for the exports of a commodity, keyed with the exchange region 'r-reg'
+    M.commodityExports = {
+        (r, p, c): tuple(
+            (r + '-' + reg, t, v, o, 1 / value(M.Efficiency[r + '-' + reg, c, t, v, o]))
+            for reg, t, v, o in exports
+        )
+        for (r, p, c), exports in M.exportRegions.items()
+    }
+
+    # the upstream (t, v, i) of each commodity, which the balances visit in every time slice
+    M.commodityUStreamInputs = {
+        (r, p, c): tuple(
+            (t, v, i) for t, v in sorted(processes) for i in M.ProcessInputsByOutput[r, p, t, v, c]
+        )
+        for (r, p, c), processes in M.commodityUStreamProcess.items()
+    }
+    M.commodityImports = {
+        (r, p, c): tuple((reg + '-' + r, t, v, i) for reg, t, v, i in imports)
+        for (r, p, c), imports in M.importRegions.items()
+    }
+
+    # flatten the input -> output pairs of each process, which are used in many of the rules
+    M.processIOPairs = {
+        (r, p, t, v): tuple(
+            (i, o)
+            for i in M.processInputs[r, p, t, v]
+            for o in M.ProcessOutputsByInput[r, p, t, v, i]
+        )
+        for r, p, t, v in M.processInputs
+    }
+    # and the (vintage, input, output) flows of each tech, for the rules summing over vintages
+    M.processFlows = {
+        (r, p, t): tuple(
+            (v, i, o) for v in M.processVintages[r, p, t] for i, o in M.processIOPairs[r, p, t, v]
+        )
+        for r, p, t in M.processVintages
+    }
+
     M.activeFlow_rpsditvo = set(
         (r, p, s, d, i, t, v, o)
         for r, p, t in M.processVintages.keys()
         if t not in M.tech_annual
-        for v in M.processVintages[r, p, t]
-        for i in M.processInputs[r, p, t, v]
-        for o in M.ProcessOutputsByInput[r, p, t, v, i]
+        for v, i, o in M.processFlows[r, p, t]
         for s in M.time_season
         for d in M.time_of_day
     )
@@ -792,9 +861,7 @@ def CreateSparseDicts(M: 'TemoaModel'):
         (r, p, i, t, v, o)
         for r, p, t in M.processVintages.keys()
         if t in M.tech_annual
-        for v in M.processVintages[r, p, t]
-        for i in M.processInputs[r, p, t, v]
-        for o in M.ProcessOutputsByInput[r, p, t, v, i]
+        for v, i, o in M.processFlows[r, p, t]
     )
 
     M.activeFlex_rpsditvo = set(
@@ -866,9 +933,201 @@ def CreateSparseDicts(M: 'TemoaModel'):
         for v in M.processVintages[r, p, t]
         if t not in M.tech_uncap
     )
+
+    # the optimization periods in which capacity of vintage v may be retired, up to period p
+    periods = sorted(M.time_optimize)
+    M.retirementPeriods = {
+        (p, v): tuple(S_p for S_p in periods if p >= S_p > v)
+        for p in periods
+        for v in M.vintage_all
+    }
     logger.debug('Completed creation of SparseDicts')
 
 
+def CreateFlowIndicesByTech(M: 'TemoaModel'):
+    """
+    Group the flow variable indices by technology:  {t: [(r, p, s, d, i, t, v, o), ...]}
+    and {t: [(r, p, i, t, v, o), ...]} for the annual flows.  Only the ActivityByTech
+    constraint (used with MGA) needs these, so they are created on first use.
+    """
+    M.flowIndicesByTech = defaultdict(list)
+    for idx in M.FlowVar_rpsditvo:
+        M.flowIndicesByTech[idx[5]].append(idx)
+    M.flowAnnualIndicesByTech = defaultdict(list)
+    for idx in M.FlowVarAnnual_rpitvo:
+        M.flowAnnualIndicesByTech[idx[3]].append(idx)
+
+
+def CreateCostIndices(M: 'TemoaModel'):
+    """
+    Gather the cost indices by period so the cost of each period does not need to filter
+    the full cost parameters:
+    1. CostInvest keys by vintage
+    2. CostFixed keys by period
+    3. CostVariable keys by period, split between the timeslice (non-annual) and annual techs
+    4. the emitting processes that carry an emission cost, by period.  Index tuples are
+       (r, e, i, t, v, o) and are split between the timeslice (non-annual) techs and the annual
+       techs.  Annual flex techs are not included as their emissions would be double counted.
+    """
+    M.costInvestByVintage = defaultdict(list)
+    for r, t, v in M.CostInvest.sparse_iterkeys():
+        M.costInvestByVintage[v].append((r, t, v))
+
+    M.costFixedByPeriod = defaultdict(list)
+    for r, p, t, v in M.CostFixed.sparse_iterkeys():
+        M.costFixedByPeriod[p].append((r, p, t, v))
+
+    M.costVariableByPeriod = defaultdict(list)
+    M.costVariableAnnualByPeriod = defaultdict(list)
+    for r, p, t, v in M.CostVariable.sparse_iterkeys():
+        if t in M.tech_annual:
+            M.costVariableAnnualByPeriod[p].append((r, p, t, v))
+        else:
+            M.costVariableByPeriod[p].append((r, p, t, v))
+
+    cost_periods = defaultdict(list)  # (r, e) : [p, ...]
+    for r, p, e in M.CostEmission.sparse_iterkeys():
+        cost_periods[r, e].append(p)
+
+    M.costEmissionsByPeriod = defaultdict(list)
+    M.costEmissionsAnnualByPeriod = defaultdict(list)
+    for r, e, i, t, v, o in M.EmissionActivity.sparse_iterkeys():
+        for p in cost_periods.get((r, e), ()):
+            if (r, p, t, v) not in M.processInputs:
+                continue
+            if t not in M.tech_annual:
+                M.costEmissionsByPeriod[p].append((r, e, i, t, v, o))
+            elif t not in M.tech_flex:
+                M.costEmissionsAnnualByPeriod[p].append((r, e, i, t, v, o))
+
+
+def CreateTechCaches(M: 'TemoaModel'):
+    """
+    Snapshot the tech sets and the tech group members as plain Python containers.
+
+    Pyomo Set membership tests carry validation overhead, so the rules test plain frozensets
+    instead.  The techs and group members are also split on tech_annual here, for the
+    activity constraints that sum the time slice and the annual flows separately.
+    """
+    M._tech_annual = frozenset(M.tech_annual)
+    M._tech_storage = frozenset(M.tech_storage)
+    M._tech_curtailment = frozenset(M.tech_curtailment)
+    M._tech_retirement = frozenset(M.tech_retirement)
+    M._tech_flex = frozenset(M.tech_flex)
+    M._tech_split = {t: ((), (t,)) if t in M._tech_annual else ((t,), ()) for t in M.tech_all}
+    M._group_members = {g: tuple(M.tech_group_members[g]) for g in M.tech_group_names}
+    M._group_techs = {
+        g: (
+            tuple(t for t in members if t not in M._tech_annual),
+            tuple(t for t in members if t in M._tech_annual),
+        )
+        for g, members in M._group_members.items()
+    }
+
+
+def CreateParamCaches(M: 'TemoaModel'):
+    """
+    Flatten the frequently used parameter values into plain dictionaries.
+
+    The capacity, emission and cost constraints pull these values once per index in
+    the tightest loops of the model build.  Resolving them through the Pyomo Param
+    (and any default function) each time is needlessly slow, so they are resolved
+    once here and read back from the dictionaries in the rules.
+    """
+    logger.debug('Started creation of parameter caches')
+    M._GDR = value(M.GlobalDiscountRate)
+
+    # only the (r, t) pairs of real processes are ever requested, so skip the (dense) defaults
+    M._cap2act = {
+        (r, t): value(M.CapacityToActivity[r, t])
+        for r, i, t, v, o in M.Efficiency.sparse_iterkeys()
+    }
+    M._eff = {k: value(eff) for k, eff in M.Efficiency.sparse_items()}
+    M._eff_inv = {k: 1 / eff for k, eff in M._eff.items()}
+    M._segfrac = {(s, d): value(M.SegFrac[s, d]) for s, d in M.SegFrac.sparse_iterkeys()}
+    M._segfrac_inv = {k: 1 / segfrac for k, segfrac in M._segfrac.items()}
+    M._plf = {k: value(M.ProcessLifeFrac[k]) for k in M.ProcessLifeFrac_rptv}
+    M._mpl = {k: value(M.ModelProcessLife[k]) for k in M.ModelProcessLife_rptv}
+
+    # capacity factors:  process-level values where provided, else the tech-level value
+    M._cf_proc = {k: value(cf) for k, cf in M.CapacityFactorProcess.sparse_items()}
+    M._cf_tech = {k: value(M.CapacityFactorTech[k]) for k in M.CapacityFactor_rsdt}
+
+    # the emission activity grouped by (r, e), so EmissionLimit does not scan the whole param
+    M._emission_activity = defaultdict(list)
+    M._emission_activity_annual = defaultdict(list)
+    for (r, e, i, t, v, o), ea in M.EmissionActivity.sparse_items():
+        if t in M._tech_annual:
+            M._emission_activity_annual[r, e].append((i, t, v, o, value(ea)))
+        else:
+            M._emission_activity[r, e].append((i, t, v, o, value(ea)))
+    logger.debug('Completed creation of parameter caches')
+
+
+def CreateExchangeMaps(M: 'TemoaModel'):
+    """
+    Map the exchange region names to and from their regions.
+
+    The exchange names are built once per region pair, so the rules do not build (and
+    discard) the strings per index.  The names are also grouped by their importing and
+    exporting regions for the reserve margin.
+    """
+    M._exchange_key = {
+        (r_i, r_j): r_i + '-' + r_j for r_i in M.regions for r_j in M.regions if r_i != r_j
+    }
+    # only the exchange regions with active processes are kept, so without exchange techs
+    # these are empty
+    active_exchanges = {r for r, p, t in M.processVintages if '-' in r}
+    M._exchange_into = defaultdict(list)
+    M._exchange_from = defaultdict(list)
+    for r1r2 in M.RegionalIndices:
+        if r1r2 not in active_exchanges:
+            continue
+        link = M._exchange_links[r1r2]
+        M._exchange_from[link.exporter].append(r1r2)
+        M._exchange_into[link.importer].append(r1r2)
+
+
+def CreateTimeSliceTables(M: 'TemoaModel'):
+    """
+    Lay out the ordered time slices and periods, and the neighbor of each one.
+
+    The constraints that link neighboring time slices (or periods) look the previous
+    one up here, rather than walking the ordered Pyomo Sets in each rule.
+    """
+    tods = tuple(M.time_of_day)
+    M._tod_first, M._tod_last = tods[0], tods[-1]
+    M._tod_prev = dict(zip(tods[1:], tods[:-1], strict=True))
+    M._tod_sorted_first = min(tods)
+    seasons = tuple(M.time_season)
+    M._season_first = seasons[0]
+    M._season_prev = dict(zip(seasons[1:], seasons[:-1], strict=True))
+    # the time slices of a period in order, so each one's predecessor is a single lookup
+    M._time_slices = tuple((s, d) for s in seasons for d in tods)
+    M._slice_prev = dict(zip(M._time_slices[1:], M._time_slices[:-1], strict=True))
+    M._slice_last = M._time_slices[-1]
+    periods = tuple(M.time_optimize)
+    M._period_first = periods[0]
+    M._period_prev = dict(zip(periods[1:], periods[:-1], strict=True))
+
+
+def ClearStorageFlows(M: 'TemoaModel'):
+    """
+    Drop any storage (charge, discharge) expressions still held after the storage
+    constraints are built.  StorageThroughput normally releases each one, this just
+    makes sure none outlive the storage constraint group.
+    """
+    M._storage_flows.clear()
+
+
+def ClearSplitTotalFlows(M: 'TemoaModel'):
+    """
+    Drop the total output flows shared by the output split constraints once those
+    constraints are built.
+    """
+    M._split_total_flows.clear()
+
+
 # ---------------------------------------------------------------
 # Create sparse parameter indices.
 # These functions are called from temoa_model.py and use the sparse keys
@@ -1043,11 +1302,13 @@ def CurtailmentVariableIndices(M: 'TemoaModel'):
 
 
 def CapacityConstraintIndices(M: 'TemoaModel'):
+    # storage capacity is handled by the storage constraints, so it is excluded here
     capacity_indices = set(
         (r, p, s, d, t, v)
         for r, p, t, v in M.activeActivity_rptv
         if t not in M.tech_annual
         if t not in M.tech_uncap
+        if t not in M.tech_storage
         for s in M.time_season
         for d in M.time_of_day
     )
@@ -1121,11 +1382,12 @@ ensure demand activity remains consistent across time slices.
     #   appreciable = not so small that we get into numerical instability when applying small multipliers
     appreciable_size = 0.0001
 
+    dsd_keys = set(M.DemandSpecificDistribution.sparse_iterkeys())
     for r, dem in anchor_season_tod:
         found_flag = False
         s0, d0 = None, None
         for s0, d0 in ((ss, dd) for ss in M.time_season for dd in M.time_of_day):
-            if (r, s0, d0, dem) in M.DemandSpecificDistribution.sparse_iterkeys():
+            if (r, s0, d0, dem) in dsd_keys:
                 if value(M.DemandSpecificDistribution[(r, s0, d0, dem)]) >= appreciable_size:
                     found_flag = True
                     break  # we have one with some value associated
@@ -1164,12 +1426,15 @@ def DemandConstraintIndices(M: 'TemoaModel'):
 
 
 def BaseloadDiurnalConstraintIndices(M: 'TemoaModel'):
+    # the (sorted) first time of day is the reference slice, so it needs no constraint
+    d_0 = min(M.time_of_day)
     indices = set(
         (r, p, s, d, t, v)
         for r, p, t in M.baseloadVintages.keys()
         for v in M.baseloadVintages[r, p, t]
         for s in M.time_season
         for d in M.time_of_day
+        if d != d_0
     )
 
     return indices
@@ -1181,6 +1446,12 @@ def RegionalExchangeCapacityConstraintIndices(M: 'TemoaModel'):
         for r_e, p, i in M.exportRegions.keys()
         for r_i, t, v, o in M.exportRegions[r_e, p, i]
     )
+    # the constraint is symmetric in the two regions, so only one of each mirrored pair is kept
+    indices = set(
+        (r_e, r_i, p, t, v)
+        for r_e, r_i, p, t, v in indices
+        if r_e < r_i or (r_i, r_e, p, t, v) not in indices
+    )
 
     return indices
 
@@ -1196,6 +1467,7 @@ def CommodityBalanceConstraintIndices(M: 'TemoaModel'):
         for r, p, o in period_commodity
         # r in this line includes interregional transfer combinations (not needed).
         if r in M.regions  # this line ensures only the regions are included.
+        if o not in M.commodity_demand  # demands are balanced by the Demand constraint
         for t, v in M.commodityUStreamProcess[r, p, o]
         if (r, t) not in M.tech_storage and t not in M.tech_annual
         for s in M.time_season
@@ -1216,6 +1488,7 @@ def CommodityBalanceAnnualConstraintIndices(M: 'TemoaModel'):
         for r, p, o in period_commodity
         # r in this line includes interregional transfer combinations (not needed).
         if r in M.regions  # this line ensures only the regions are included.
+        if o not in M.commodity_demand  # demands are balanced by the Demand constraint
         for t, v in M.commodityUStreamProcess[r, p, o]
         if (r, t) not in M.tech_storage and t in M.tech_annual
     )
@@ -1250,11 +1523,14 @@ def StorageInitConstraintIndices(M: 'TemoaModel'):
 
 
 def RampConstraintDayIndices(M: 'TemoaModel'):
+    # the ramp is measured from the previous time of day, so the first one is excluded
+    d_first = M.time_of_day.first()
     indices = set(
         (r, p, s, d, t, v)
         for r, p, t in M.rampVintages.keys()
         for s in M.time_season
         for d in M.time_of_day
+        if d != d_first
         for v in M.rampVintages[r, p, t]
     )
 
@@ -1272,14 +1548,6 @@ def RampConstraintSeasonIndices(M: 'TemoaModel'):
     return indices
 
 
-def RampConstraintPeriodIndices(M: 'TemoaModel'):
-    indices = set(
-        (r, p, t, v) for r, p, t in M.rampVintages.keys() for v in M.rampVintages[r, p, t]
-    )
-
-    return indices
-
-
 def ReserveMarginIndices(M: 'TemoaModel'):
     indices = set(
         (r, p, s, d)
@@ -92,7 +92,25 @@ class TemoaModel(AbstractModel):
         M.activeCapacityAvailable_rpt = None
         M.activeCapacityAvailable_rptv = None
         M.commodityDStreamProcess = dict()  # The downstream process of a commodity during a period
+        M.commodityDStreamStorage = dict()
+        """downstream processes with techs in tech_storage {(r, p, c): ((t, v, o, 1/eff), ...)}"""
+
+        M.commodityDStreamNonAnnual = dict()
+        """other downstream (timeslice) processes {(r, p, c): ((t, v, o, 1/eff), ...)}"""
+
+        M.commodityDStreamAnnual = dict()
+        """downstream processes with techs in tech_annual {(r, p, c): ((t, v, o, 1/eff), ...)}"""
+
         M.commodityUStreamProcess = dict()  # The upstream process of a commodity during a period
+        M.commodityUStreamProcessAnnual = dict()
+        """the upstream processes with techs in tech_annual {(r, p, c): ((t, v), ...)}"""
+
+        M.commodityUStreamProcessNonAnnual = dict()
+        """the upstream processes with techs not in tech_annual {(r, p, c): ((t, v), ...)}"""
+
+        M.commodityUStreamInputs = dict()
+        """inputs of the upstream processes of a commodity {(r, p, c): ((t, v, i), ...)}"""
+
         M.ProcessInputsByOutput = dict()
         M.ProcessOutputsByInput = dict()
         M.processTechs = dict()
@@ -100,6 +118,12 @@ class TemoaModel(AbstractModel):
         M.processVintages = dict()
         """current available (within lifespan) vintages {(r, p, t) : set(v)}"""
 
+        M.processIOPairs = dict()
+        """input/output commodity pairs of active processes {(r, p, t, v) : ((i, o), ...)}"""
+
+        M.processFlows = dict()
+        """(vintage, input, output) flows of active techs {(r, p, t) : ((v, i, o), ...)}"""
+
         M.baseloadVintages = dict()
         M.curtailmentVintages = dict()
         M.storageVintages = dict()
@@ -109,8 +133,165 @@ class TemoaModel(AbstractModel):
         M.outputsplitVintages = dict()
         M.ProcessByPeriodAndOutput = dict()
         M.exportRegions = dict()
+        M.commodityExports = dict()
+        """exports of a commodity by exchange region {(r, p, c): ((r-reg, t, v, o, 1/eff), ...)}"""
+
         M.importRegions = dict()
+        M.commodityImports = dict()
+        """imports of a commodity by exchange region {(r, p, c): ((reg-r, t, v, i), ...)}"""
+
         M.flex_commodities = set()
+        M.flowIndicesByTech = None
+        """FlowVar_rpsditvo indices by tech (created on first use) {t: [rpsditvo]}"""
+
+        M.flowAnnualIndicesByTech = None
+        """FlowVarAnnual_rpitvo indices by tech (created on first use) {t: [rpitvo]}"""
+
+        M.costInvestByVintage = dict()
+        """CostInvest indices by vintage {v: [(r, t, v)]}"""
+
+        M.costFixedByPeriod = dict()
+        """CostFixed indices by period {p: [(r, p, t, v)]}"""
+
+        M.costVariableByPeriod = dict()
+        """CostVariable indices of non-annual techs by period {p: [(r, p, t, v)]}"""
+
+        M.costVariableAnnualByPeriod = dict()
+        """CostVariable indices of annual techs by period {p: [(r, p, t, v)]}"""
+
+        M.costEmissionsByPeriod = dict()
+        """emitting non-annual processes with an emission cost {p: [(r, e, i, t, v, o)]}"""
+
+        M.costEmissionsAnnualByPeriod = dict()
+        """emitting annual (non-flex) processes with an emission cost {p: [(r, e, i, t, v, o)]}"""
+
+        M.retirementPeriods = dict()
+        """optimization periods with possible retirements of a vintage {(p, v): (S_p, ...)}"""
+
+        # Flattened parameter values, filled by CreateParamCaches after the Params are built
+        M._GDR = None
+        """the value of GlobalDiscountRate"""
+
+        M._cap2act = dict()
+        """CapacityToActivity values for the active processes {(r, t): c2a}"""
+
+        M._eff = dict()
+        """Efficiency values {(r, i, t, v, o): eff}"""
+
+        M._eff_inv = dict()
+        """reciprocal Efficiency values {(r, i, t, v, o): 1/eff}"""
+
+        M._segfrac = dict()
+        """SegFrac values {(s, d): segfrac}"""
+
+        M._segfrac_inv = dict()
+        """reciprocal SegFrac values {(s, d): 1/segfrac}"""
+
+        M._plf = dict()
+        """ProcessLifeFrac values {(r, p, t, v): plf}"""
+
+        M._mpl = dict()
+        """ModelProcessLife values {(r, p, t, v): mpl}"""
+
+        M._cf_proc = dict()
+        """explicitly provided CapacityFactorProcess values {(r, s, d, t, v): cf}"""
+
+        M._cf_tech = dict()
+        """CapacityFactorTech values, including defaults {(r, s, d, t): cf}"""
+
+        M._emission_activity = dict()
+        """EmissionActivity of the non-annual techs {(r, e): [(i, t, v, o, ea), ...]}"""
+
+        M._emission_activity_annual = dict()
+        """EmissionActivity of the annual techs {(r, e): [(i, t, v, o, ea), ...]}"""
+
+        # snapshots of the tech sets for the membership tests in the constraint rules, filled
+        # by CreateTechCaches
+        M._tech_annual = frozenset()
+        M._tech_storage = frozenset()
+        M._tech_curtailment = frozenset()
+        M._tech_retirement = frozenset()
+        M._tech_flex = frozenset()
+
+        M._tech_split = dict()
+        """each tech as the (non-annual, annual) pair used by the activity rules {t: ((t,), ())}"""
+
+        M._group_members = dict()
+        """the members of each tech group as a tuple {g: (t, ...)}"""
+
+        M._group_techs = dict()
+        """the members of each tech group split on tech_annual {g: (non-annual, annual)}"""
+
+        M._region_groups = dict()
+        """the member regions of each (group) region name {'r_1+r_2': ('r_1', 'r_2')}"""
+
+        M._exchange_links = dict()
+        """the (exporter, importer) regions of each exchange name {'r_i-r_j': ExchangeLink}"""
+
+        # exchange region maps, filled by CreateExchangeMaps
+        M._exchange_key = dict()
+        """exchange region names {(r_i, r_j): 'r_i-r_j'}"""
+
+        M._exchange_into = dict()
+        """exchange region names by the importing region {r_j: ['r_i-r_j', ...]}"""
+
+        M._exchange_from = dict()
+        """exchange region names by the exporting region {r_i: ['r_i-r_j', ...]}"""
+
+        M._storage_flows = dict()
+        """storage (charge, discharge) expressions shared by the storage constraints"""
+
+        M._split_total_flows = dict()
+        """all output flows of a process, shared by its output split constraints"""
+
+        M._growth_periods = dict()
+        """periods with available capacity of a tech and their predecessor {t: {p: p_prev}}"""
+
+        M._reserve_capacity = dict()
+        """firm capacity terms of the reserve techs {(r, p): (coef array, [V_Capacity, ...])}"""
+
+        M._group_activity = dict()
+        """output flows of a tech group, shared by its activity shares {(regions, p, g): [...]}"""
+
+        M._group_capacity_techs = dict()
+        """group members with (new) capacity for the capacity shares {(r, p, g, new): (t, ...)}"""
+
+        # time slice ordering, filled by CreateTimeSliceTables
+        M._time_slices = tuple()
+        """all the (s, d) time slices, season-major, shared by the rules summing over a year"""
+
+        M._tod_first = None
+        M._tod_last = None
+        M._tod_prev = dict()
+        """previous time of day {d: d_prev} (the first time of day is not a key)"""
+
+        M._tod_sorted_first = None
+        """the first time of day when sorted, used as the reference slice in BaseloadDiurnal"""
+
+        M._season_first = None
+        M._season_prev = dict()
+        """previous season {s: s_prev} (the first season is not a key)"""
+
+        M._slice_prev = dict()
+        """previous time slice in the period {(s, d): (s_prev, d_prev)} (not keyed by the first)"""
+
+        M._slice_last = None
+
+        M._period_first = None
+        M._period_prev = dict()
+        """previous optimization period {p: p_prev} (the first period is not a key)"""
+
+        M._segfrac_per_season = dict()
+        """sum of the SegFrac of each season {s: segfrac}, filled by SegFracPerSeason_rule"""
+
+        M._model_process_life = dict()
+        """years of a process's life within each period {(r, p, t, v): years}"""
+
+        M._process_life_frac = dict()
+        """fraction of each period a process is alive {(r, p, t, v): frac}"""
+
+        M._period_length = dict()
+        """length of each optimization period {p: next p - p}, filled by ParamPeriodLength"""
 
         ################################################
         #                 Model Sets                   #
@@ -392,6 +573,8 @@ class TemoaModel(AbstractModel):
         M.EmissionLimit = Param(M.EmissionLimitConstraint_rpe)
         M.EmissionActivity_reitvo = Set(dimen=6, initialize=EmissionActivityIndices)
         M.EmissionActivity = Param(M.EmissionActivity_reitvo)
+        # group the cost (and emission cost) indices by period for the objective function
+        M.Create_CostIndices = BuildAction(rule=CreateCostIndices)
 
         M.MinActivityGroup_rpg = Set(
             within=M.RegionalGlobalIndices * M.time_optimize * M.tech_group_names
@@ -460,6 +643,12 @@ class TemoaModel(AbstractModel):
 
         M.MyopicBaseyear = Param(default=0)
 
+        # snapshot the tech sets and flatten the frequently used param values for the rules below
+        M.Create_TechCaches = BuildAction(rule=CreateTechCaches)
+        M.Create_ParamCaches = BuildAction(rule=CreateParamCaches)
+        M.Create_ExchangeMaps = BuildAction(rule=CreateExchangeMaps)
+        M.Create_TimeSliceTables = BuildAction(rule=CreateTimeSliceTables)
+
         ################################################
         #                 Model Variables              #
         #               (assigned by solver)           #
@@ -628,6 +817,7 @@ class TemoaModel(AbstractModel):
         M.StorageThroughputConstraint = Constraint(
             M.StorageConstraints_rpsdtv, rule=StorageThroughput_Constraint
         )
+        M.Clear_StorageFlows = BuildAction(rule=ClearStorageFlows)
 
         M.StorageInitConstraint_rtv = Set(dimen=2, initialize=StorageInitConstraintIndices)
         M.StorageInitConstraint = Constraint(
@@ -648,14 +838,6 @@ class TemoaModel(AbstractModel):
         #     M.RampConstraintSeason_rpstv, rule=RampDownSeason_Constraint
         # )
 
-        M.RampConstraintPeriod_rptv = Set(dimen=4, initialize=RampConstraintPeriodIndices)
-        M.RampUpConstraintPeriod = Constraint(
-            M.RampConstraintPeriod_rptv, rule=RampUpPeriod_Constraint
-        )
-        M.RampDownConstraintPeriod = Constraint(
-            M.RampConstraintPeriod_rptv, rule=RampDownPeriod_Constraint
-        )
-
         M.ReserveMargin_rpsd = Set(dimen=4, initialize=ReserveMarginIndices)
         M.ReserveMarginConstraint = Constraint(M.ReserveMargin_rpsd, rule=ReserveMargin_Constraint)
 
@@ -796,6 +978,7 @@ class TemoaModel(AbstractModel):
         M.TechOutputSplitAnnualConstraint = Constraint(
             M.TechOutputSplitAnnualConstraint_rptvo, rule=TechOutputSplitAnnual_Constraint
         )
+        M.Clear_SplitTotalFlows = BuildAction(rule=ClearSplitTotalFlows)
 
         M.RenewablePortfolioStandardConstraint = Constraint(
             M.RenewablePortfolioStandardConstraint_rpg, rule=RenewablePortfolioStandard_Constraint
@@ -19,14 +19,18 @@ in LICENSE.txt.  Users uncompressing this from an archive may not have
 received this license file.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from collections import defaultdict
 from logging import getLogger
 from sys import stderr as SE
-from typing import TYPE_CHECKING, Iterable
+from typing import TYPE_CHECKING
 
+import numpy as np
 from pyomo.core import Var, Expression
-from pyomo.environ import Constraint, value
+from pyomo.core.expr.numeric_expr import LinearExpression
+from pyomo.environ import Constraint, quicksum, value
 
 from temoa.temoa_model.temoa_initialize import (
+    CreateFlowIndicesByTech,
     DemandConstraintErrorCheck,
     CommodityBalanceConstraintErrorCheck,
     CommodityBalanceConstraintErrorCheckAnnual,
@@ -48,20 +52,28 @@ def AdjustedCapacity_Constraint(M: 'TemoaModel', r, p, t, v):
     For a given :code:`(r,p,t,v)` index, this constraint sets the capacity equal to
     the amount installed in period :code:`v` and subtracts from it any and all retirements
     that occurred up until the period in question, :code:`p`."""
-    if t not in M.tech_retirement:
+    if t not in M._tech_retirement:
         if v in M.time_exist:
             return M.V_Capacity[r, p, t, v] == M.ExistingCapacity[r, t, v]
         else:
             return M.V_Capacity[r, p, t, v] == M.V_NewCapacity[r, t, v]
 
     else:
-        retired_cap = sum(
-            M.V_RetiredCapacity[r, S_p, t, v] for S_p in M.time_optimize if p >= S_p > v
-        )
+        # all coefficients are known up front, so build the linear expression directly
+        retired_cap = [M.V_RetiredCapacity[r, S_p, t, v] for S_p in M.retirementPeriods[p, v]]
         if v in M.time_exist:
-            return M.V_Capacity[r, p, t, v] == M.ExistingCapacity[r, t, v] - retired_cap
+            remaining_cap = LinearExpression(
+                constant=M.ExistingCapacity[r, t, v],
+                linear_coefs=[-1] * len(retired_cap),
+                linear_vars=retired_cap,
+            )
         else:
-            return M.V_Capacity[r, p, t, v] == M.V_NewCapacity[r, t, v] - retired_cap
+            remaining_cap = LinearExpression(
+                constant=0,
+                linear_coefs=[1] + [-1] * len(retired_cap),
+                linear_vars=[M.V_NewCapacity[r, t, v]] + retired_cap,
+            )
+        return M.V_Capacity[r, p, t, v] == remaining_cap
 
 
 def Capacity_Constraint(M: 'TemoaModel', r, p, s, d, t, v):
@@ -95,41 +107,33 @@ def Capacity_Constraint(M: 'TemoaModel', r, p, s, d, t, v):
        \\
        \forall \{r, p, s, d, t, v\} \in \Theta_{\text{FO}}
     """
-    if t in M.tech_storage:
-        return Constraint.Skip
     # The expressions below are defined in-line to minimize the amount of
     # expression cloning taking place with Pyomo.
 
-    useful_activity = sum(
-        M.V_FlowOut[r, p, s, d, S_i, t, v, S_o]
-        for S_i in M.processInputs[r, p, t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
+    useful_activity = quicksum(
+        M.V_FlowOut[r, p, s, d, S_i, t, v, S_o] for S_i, S_o in M.processIOPairs[r, p, t, v]
     )
-    if (r, s, d, t, v) in M.CapacityFactorProcess:
-        # use the data provided
-        capacity = value(M.CapacityFactorProcess[r, s, d, t, v])
-    else:  # use the capacity factor for the tech
-        capacity = value(M.CapacityFactorTech[r, s, d, t])
+    capacity = M._cf_proc.get((r, s, d, t, v))
+    if capacity is None:  # use the capacity factor for the tech
+        capacity = M._cf_tech[r, s, d, t]
 
-    if t in M.tech_curtailment:
+    max_activity = capacity * M._cap2act[r, t] * M._segfrac[s, d] * M._plf[r, p, t, v]
+
+    if t in M._tech_curtailment:
         # If technologies are present in the curtailment set, then enough
         # capacity must be available to cover both activity and curtailment.
-        return capacity * value(M.CapacityToActivity[r, t]) * value(M.SegFrac[s, d]) * value(
-            M.ProcessLifeFrac[r, p, t, v]
-        ) * M.V_Capacity[r, p, t, v] == useful_activity + sum(
-            M.V_Curtailment[r, p, s, d, S_i, t, v, S_o]
-            for S_i in M.processInputs[r, p, t, v]
-            for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
+        curtailment = quicksum(
+            M.V_Curtailment[r, p, s, d, S_i, t, v, S_o] for S_i, S_o in M.processIOPairs[r, p, t, v]
         )
+        if max_activity == 0:
+            return useful_activity + curtailment == 0
+        return max_activity * M.V_Capacity[r, p, t, v] == useful_activity + curtailment
     else:
-        return (
-            capacity
-            * value(M.CapacityToActivity[r, t])
-            * value(M.SegFrac[s, d])
-            * value(M.ProcessLifeFrac[r, p, t, v])
-            * M.V_Capacity[r, p, t, v]
-            >= useful_activity
-        )
+        # A zero capacity factor (e.g. solar at night) still has to hold the activity to zero, so
+        # the constraint can't be skipped, but the (zero) capacity term can be dropped.
+        if max_activity == 0:
+            return useful_activity <= 0
+        return max_activity * M.V_Capacity[r, p, t, v] >= useful_activity
 
 
 def CapacityAnnual_Constraint(M: 'TemoaModel', r, p, t, v):
@@ -160,19 +164,11 @@ capacity.
 """
     CF = 1  # placeholder CF
 
-    activity_rptv = sum(
-        M.V_FlowOutAnnual[r, p, S_i, t, v, S_o]
-        for S_i in M.processInputs[r, p, t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
+    activity_rptv = quicksum(
+        M.V_FlowOutAnnual[r, p, S_i, t, v, S_o] for S_i, S_o in M.processIOPairs[r, p, t, v]
     )
 
-    return (
-        CF
-        * value(M.CapacityToActivity[r, t])
-        * value(M.ProcessLifeFrac[r, p, t, v])
-        * M.V_Capacity[r, p, t, v]
-        >= activity_rptv
-    )
+    return CF * M._cap2act[r, t] * M._plf[r, p, t, v] * M.V_Capacity[r, p, t, v] >= activity_rptv
 
 
 def ActivityByTech_Constraint(M: 'TemoaModel', t):
@@ -194,18 +190,15 @@ def ActivityByTech_Constraint(M: 'TemoaModel', t):
            \;
            \forall t \in T^{a}
     """
+    if M.flowIndicesByTech is None:
+        CreateFlowIndicesByTech(M)
+
     if t not in M.tech_annual:
-        indices = []
-        for s_index in M.FlowVar_rpsditvo:
-            if t in s_index:
-                indices.append(s_index)
-        activity = sum(M.V_FlowOut[s_index] for s_index in indices)
+        indices = M.flowIndicesByTech.get(t, ())
+        activity = quicksum(M.V_FlowOut[s_index] for s_index in indices)
     else:
-        indices = []
-        for s_index in M.FlowVarAnnual_rpitvo:
-            if t in s_index:
-                indices.append(s_index)
-        activity = sum(M.V_FlowOutAnnual[s_index] for s_index in indices)
+        indices = M.flowAnnualIndicesByTech.get(t, ())
+        activity = quicksum(M.V_FlowOutAnnual[s_index] for s_index in indices)
 
     if int is type(activity):
         return Constraint.Skip
@@ -237,9 +230,11 @@ throughout the period.
    \\
    \forall p \in \text{P}^o, r \in R, t \in T
 """
-    cap_avail = sum(
-        value(M.ProcessLifeFrac[r, p, t, S_v]) * M.V_Capacity[r, p, t, S_v]
-        for S_v in M.processVintages[r, p, t]
+    vintages = M.processVintages[r, p, t]
+    cap_avail = LinearExpression(
+        constant=0,
+        linear_coefs=[M._plf[r, p, t, S_v] for S_v in vintages],
+        linear_vars=[M.V_Capacity[r, p, t, S_v] for S_v in vintages],
     )
 
     expr = M.V_CapacityAvailableByPeriodAndTech[r, p, t] == cap_avail
@@ -262,10 +257,10 @@ previous period's total installed capacity (CAPAVL)
    \\
    \forall \{r, p, t, v\} \in \Theta_{\text{RetiredCapacity}}
 """
-    if p == M.time_optimize.first():
+    if p == M._period_first:
         cap_avail = M.ExistingCapacity[r, t, v]
     else:
-        cap_avail = M.V_Capacity[r, M.time_optimize.prev(p), t, v]
+        cap_avail = M.V_Capacity[r, M._period_prev[p], t, v]
     expr = M.V_RetiredCapacity[r, p, t, v] <= cap_avail
     return expr
 
@@ -370,7 +365,17 @@ def TotalCost_rule(M):
 
     """
 
-    return sum(PeriodCost_rule(M, p) for p in M.time_optimize)
+    # The (linear) cost terms of all periods are pooled into one expression so that the
+    # objective is not re-summed period by period.
+    P_0, P_e = cost_horizon(M)
+    coefs = []
+    cost_vars = []
+    for p in M.time_optimize:
+        p_coefs, p_cost_vars = period_cost_components(M, p, P_0, P_e)
+        coefs.extend(p_coefs)
+        cost_vars.extend(p_cost_vars)
+
+    return LinearExpression(constant=0, linear_coefs=coefs, linear_vars=cost_vars)
 
 
 def loan_cost(
@@ -396,28 +401,20 @@ def loan_cost(
     :param vintage: the base year of the loan
     :return: fixed number or pyomo expression based on input types
     """
+    payments_made = min(lifetime_loan_process, P_e - vintage)
     if GDR == 0:  # return the non-discounted result
-        regular_payment = capacity * invest_cost * loan_annualize
-        payments_made = min(lifetime_loan_process, P_e - vintage)
-        return regular_payment * payments_made
+        return capacity * (invest_cost * loan_annualize * payments_made)
     x = 1 + GDR  # a convenience
-    res = (
-        capacity
-        * (
-            invest_cost
-            * loan_annualize
-            * (
-                lifetime_loan_process
-                if not GDR
-                else (x ** (P_0 - vintage + 1) * (1 - x ** (-lifetime_loan_process)) / GDR)
-            )
-        )
-        * (
-            (1 - x ** (-min(lifetime_loan_process, P_e - vintage)))
-            / (1 - x ** (-lifetime_loan_process))
-        )
+    # the discounting is all scalar math, so resolve it fully before applying it to the capacity
+    # (which may be a Var).  This keeps the float path lean and yields a single product term.
+    loan_life_factor = 1 - x ** (-lifetime_loan_process)  # appears twice, so compute it once
+    unit_cost = (
+        invest_cost
+        * loan_annualize
+        * (x ** (P_0 - vintage + 1) * loan_life_factor / GDR)
+        * ((1 - x ** (-payments_made)) / loan_life_factor)
     )
-    return res
+    return capacity * unit_cost
 
 
 def fixed_or_variable_cost(
@@ -439,87 +436,167 @@ def fixed_or_variable_cost(
     :param p: the period under evaluation
     :return:
     """
+    if not GDR:
+        return cap_or_flow * (cost_factor * process_lifetime)
     x = 1 + GDR
-    res = cap_or_flow * (
-        cost_factor
-        * (
-            process_lifetime
-            if not GDR
-            else (x ** (P_0 - p + 1) * (1 - x ** (-process_lifetime)) / GDR)
-        )
-    )
-    return res
+    return cap_or_flow * (cost_factor * (x ** (P_0 - p + 1) * (1 - x ** (-process_lifetime)) / GDR))
 
 
-def PeriodCost_rule(M: 'TemoaModel', p):
-    P_0 = min(M.time_optimize)
-    P_e = M.time_future.last()  # End point of modeled horizon
-    GDR = value(M.GlobalDiscountRate)
-    MPL = M.ModelProcessLife
+def loan_cost_coefficients(
+    invest_cost: np.ndarray,
+    loan_annualize: np.ndarray,
+    lifetime_loan_process: np.ndarray,
+    P_0: int,
+    P_e: int,
+    GDR: float,
+    vintage: int | np.ndarray,
+) -> np.ndarray:
+    """
+    vectorized version of loan_cost for a unit of capacity.  Computes the cost coefficients
+    of many loans in one pass.  The reporting uses loan_cost, so the formulas must match.
+    GDR is a single model-wide value, so the (un)discounted choice is made once per batch
+    and the per-loan work (including the payment clipping) is branch free.
+    :param invest_cost: array of the cost/capacity
+    :param loan_annualize: array of the loan annualization rates
+    :param lifetime_loan_process: array of the loan lifetimes
+    :param P_0: the year to discount the costs back to
+    :param P_e: the 'end year' or cutoff year for loan payments
+    :param GDR: Global Discount Rate
+    :param vintage: the base year of the loans (scalar or array)
+    :return: array of the cost per unit of capacity
+    """
+    payments_made = np.minimum(lifetime_loan_process, P_e - vintage)
+    if GDR == 0:  # return the non-discounted result
+        return invest_cost * loan_annualize * payments_made
+    x = 1 + GDR  # a convenience
+    loan_life_factor = 1 - x ** (-lifetime_loan_process)
+    annuity = x ** (P_0 - vintage + 1) * loan_life_factor / GDR
+    truncation = (1 - x ** (-payments_made)) / loan_life_factor
+    return invest_cost * loan_annualize * annuity * truncation
 
+
+def fixed_or_variable_cost_coefficients(
+    cost_factor: np.ndarray,
+    process_lifetime: np.ndarray,
+    GDR: float | None,
+    P_0: float,
+    p: int,
+) -> np.ndarray:
+    """
+    vectorized version of fixed_or_variable_cost for a unit of capacity or flow.  The
+    reporting uses fixed_or_variable_cost, so the formulas must match.
+    :param cost_factor: array of the costs (either fixed or variable)
+    :param process_lifetime: array of the model process lifetimes
+    :param GDR: discount rate or None
+    :param P_0: the period to discount this back to
+    :param p: the period under evaluation
+    :return: array of the cost per unit of capacity or flow
+    """
+    if not GDR:
+        return cost_factor * process_lifetime
+    x = 1 + GDR
+    return cost_factor * (x ** (P_0 - p + 1) * (1 - x ** (-process_lifetime)) / GDR)
+
+
+def cost_horizon(M: 'TemoaModel') -> tuple[int, int]:
+    """
+    The horizon used for discounting the costs
+    :param M: the model
+    :return: tuple of (year to discount costs back to, end point of the modeled horizon)
+    """
+    P_0 = M.time_optimize.first()
     if value(M.MyopicBaseyear) != 0:
         P_0 = value(M.MyopicBaseyear)
+    P_e = M.time_future.last()  # End point of modeled horizon
+    return P_0, P_e
 
-    loan_costs = sum(
-        loan_cost(
-            M.V_NewCapacity[r, S_t, S_v],
-            M.CostInvest[r, S_t, S_v],
-            M.LoanAnnualize[r, S_t, S_v],
-            value(M.LoanLifetimeProcess[r, S_t, S_v]),
-            P_0,
-            P_e,
-            GDR,
-            vintage=S_v,
-        )
-        for r, S_t, S_v in M.CostInvest.sparse_iterkeys()
-        if S_v == p
-    )
 
-    fixed_costs = sum(
-        fixed_or_variable_cost(
-            M.V_Capacity[r, p, S_t, S_v],
-            M.CostFixed[r, p, S_t, S_v],
-            MPL[r, p, S_t, S_v],
-            GDR,
-            P_0,
-            p=p,
-        )
-        for r, S_p, S_t, S_v in M.CostFixed.sparse_iterkeys()
-        if S_p == p
-    )
+def PeriodCost_rule(M: 'TemoaModel', p):
+    P_0, P_e = cost_horizon(M)
+    coefs, cost_vars = period_cost_components(M, p, P_0, P_e)
+    return LinearExpression(constant=0, linear_coefs=coefs, linear_vars=cost_vars)
 
-    variable_costs = sum(
-        fixed_or_variable_cost(
-            M.V_FlowOut[r, p, s, d, S_i, S_t, S_v, S_o],
-            M.CostVariable[r, p, S_t, S_v],
-            MPL[r, p, S_t, S_v],
-            GDR,
-            P_0,
-            p,
-        )
-        for r, S_p, S_t, S_v in M.CostVariable.sparse_iterkeys()
-        if S_p == p and S_t not in M.tech_annual
-        for S_i in M.processInputs[r, S_p, S_t, S_v]
-        for S_o in M.ProcessOutputsByInput[r, S_p, S_t, S_v, S_i]
-        for s in M.time_season
-        for d in M.time_of_day
-    )
 
-    variable_costs_annual = sum(
-        fixed_or_variable_cost(
-            M.V_FlowOutAnnual[r, p, S_i, S_t, S_v, S_o],
-            M.CostVariable[r, p, S_t, S_v],
-            MPL[r, p, S_t, S_v],
-            GDR,
-            P_0,
-            p,
+def period_cost_components(M: 'TemoaModel', p, P_0: int, P_e: int) -> tuple[list[float], list[Var]]:
+    """
+    Gather the costs of a period.  All of the costs (loan, fixed, variable, and emission) are
+    linear, so they are returned as matching lists of coefficients and variables.
+    :param M: the model
+    :param p: the period
+    :param P_0: the year to discount the costs back to
+    :param P_e: the end point of the modeled horizon
+    :return: tuple of (coefficients, variables)
+    """
+    GDR = M._GDR
+    MPL = M._mpl
+
+    # The loan, fixed, and variable costs are all linear in a single variable, so rather than
+    # letting pyomo build (and clone) the sum term-by-term, the cost coefficients are computed
+    # in bulk and the expression is assembled directly.
+
+    # loan costs
+    loan_keys = M.costInvestByVintage.get(p, [])
+    loan_coefs = loan_cost_coefficients(
+        invest_cost=np.array([M.CostInvest[k] for k in loan_keys], dtype=float),
+        loan_annualize=np.array([M.LoanAnnualize[k] for k in loan_keys], dtype=float),
+        lifetime_loan_process=np.array(
+            [value(M.LoanLifetimeProcess[k]) for k in loan_keys], dtype=float
+        ),
+        P_0=P_0,
+        P_e=P_e,
+        GDR=GDR,
+        vintage=p,
+    )
+    coefs = loan_coefs.tolist()
+    cost_vars = [M.V_NewCapacity[k] for k in loan_keys]
+
+    fixed_keys = M.costFixedByPeriod.get(p, [])
+    var_keys = M.costVariableByPeriod.get(p, [])
+    var_annual_keys = M.costVariableAnnualByPeriod.get(p, [])
+    emission_keys = M.costEmissionsByPeriod.get(p, [])
+    emission_annual_keys = M.costEmissionsAnnualByPeriod.get(p, [])
+    all_emission_keys = emission_keys + emission_annual_keys
+
+    # Within the period, the discounting of the fixed, variable, and emission costs depends only
+    # on the process lifetime, and there are few distinct lifetimes.  So the factor for a unit of
+    # cost is computed once per lifetime and scaled by each cost.
+    lifetimes = {MPL[k] for k in fixed_keys}
+    lifetimes.update(MPL[k] for k in var_keys)
+    lifetimes.update(MPL[k] for k in var_annual_keys)
+    lifetimes.update(MPL[r, p, t, v] for r, e, i, t, v, o in all_emission_keys)
+    lifetimes = sorted(lifetimes)
+    lifetime_factors = dict(
+        zip(
+            lifetimes,
+            fixed_or_variable_cost_coefficients(
+                cost_factor=np.ones(len(lifetimes)),
+                process_lifetime=np.array(lifetimes, dtype=float),
+                GDR=GDR,
+                P_0=P_0,
+                p=p,
+            ).tolist(),
+            strict=True,
         )
-        for r, S_p, S_t, S_v in M.CostVariable.sparse_iterkeys()
-        if S_p == p and S_t in M.tech_annual
-        for S_i in M.processInputs[r, S_p, S_t, S_v]
-        for S_o in M.ProcessOutputsByInput[r, S_p, S_t, S_v, S_i]
     )
 
+    # fixed costs
+    coefs.extend(M.CostFixed[k] * lifetime_factors[MPL[k]] for k in fixed_keys)
+    cost_vars.extend(M.V_Capacity[k] for k in fixed_keys)
+
+    # variable costs (both the timeslice and the annual flows)
+    time_slices = M._time_slices
+    var_coefs = [M.CostVariable[k] * lifetime_factors[MPL[k]] for k in var_keys + var_annual_keys]
+    for (r, S_p, S_t, S_v), var_cost in zip(var_keys, var_coefs[: len(var_keys)], strict=True):
+        for S_i, S_o in M.processIOPairs[r, S_p, S_t, S_v]:
+            coefs.extend([var_cost] * len(time_slices))
+            cost_vars.extend(M.V_FlowOut[r, p, s, d, S_i, S_t, S_v, S_o] for s, d in time_slices)
+    for (r, S_p, S_t, S_v), var_cost in zip(
+        var_annual_keys, var_coefs[len(var_keys) :], strict=True
+    ):
+        for S_i, S_o in M.processIOPairs[r, S_p, S_t, S_v]:
+            coefs.append(var_cost)
+            cost_vars.append(M.V_FlowOutAnnual[r, p, S_i, S_t, S_v, S_o])
+
     # The emissions costs occur over the five possible emission sources.
     # to do any/all of them we need 2 baseline sets:  The regular and annual sets
     # of indices that are valid which is basically the filter of:
@@ -532,62 +609,39 @@ def PeriodCost_rule(M: 'TemoaModel', p):
     # Curtailment does not draw any inputs, so it seems logical that curtailed flows not be taxed either
     # Earlier versions of this code had accounting for flex & curtailment that have been removed.
 
-    base = [
-        (r, p, e, i, t, v, o)
-        for (r, e, i, t, v, o) in M.EmissionActivity
-        if (r, p, e) in M.CostEmission  # tightest filter first
-        and (r, p, t, v) in M.processInputs
-    ]
+    # The base sets are pre-filtered (by period) in CreateCostIndices.  The normal set is
+    # expanded over the season/tod below.
 
-    # then expand the base for the normal (season/tod) set and annual separately:
-    normal = [
-        (r, p, e, s, d, i, t, v, o)
-        for (r, p, e, i, t, v, o) in base
-        for s in M.time_season
-        for d in M.time_of_day
-        if t not in M.tech_annual
+    # The emission costs are linear in the flows as well:  the emission activity is folded into
+    # the cost factor so each flow gets a single coefficient.
+    emission_coefs = [
+        M.CostEmission[r, p, e]
+        * M.EmissionActivity[r, e, i, t, v, o]
+        * lifetime_factors[MPL[r, p, t, v]]
+        for r, e, i, t, v, o in all_emission_keys
     ]
 
-    annual = [(r, p, e, i, t, v, o) for (r, p, e, i, t, v, o) in base if t in M.tech_annual]
-
     # 1. variable emissions
-    var_emissions = sum(
-        fixed_or_variable_cost(
-            cap_or_flow=M.V_FlowOut[r, p, s, d, i, t, v, o] * M.EmissionActivity[r, e, i, t, v, o],
-            cost_factor=M.CostEmission[r, p, e],
-            process_lifetime=MPL[r, p, t, v],
-            GDR=GDR,
-            P_0=P_0,
-            p=p,
-        )
-        for (r, p, e, s, d, i, t, v, o) in normal
-    )
+    for (r, _e, i, t, v, o), emission_cost in zip(
+        emission_keys, emission_coefs[: len(emission_keys)], strict=True
+    ):
+        coefs.extend([emission_cost] * len(time_slices))
+        cost_vars.extend(M.V_FlowOut[r, p, s, d, i, t, v, o] for s, d in time_slices)
 
     # 2. flex emissions -- removed (double counting)
 
     # 3. curtailment emissions -- removed (curtailment consumes no input, so no emittances)
 
     # 4. annual emissions
-    var_annual_emissions = sum(
-        fixed_or_variable_cost(
-            cap_or_flow=M.V_FlowOutAnnual[r, p, i, t, v, o] * M.EmissionActivity[r, e, i, t, v, o],
-            cost_factor=M.CostEmission[r, p, e],
-            process_lifetime=MPL[r, p, t, v],
-            GDR=GDR,
-            P_0=P_0,
-            p=p,
-        )
-        for (r, p, e, i, t, v, o) in annual
-        if t not in M.tech_flex
-    )
-    # 5. flex annual emissions -- removed (double counting)
+    for (r, _e, i, t, v, o), emission_cost in zip(
+        emission_annual_keys, emission_coefs[len(emission_keys) :], strict=True
+    ):
+        coefs.append(emission_cost)
+        cost_vars.append(M.V_FlowOutAnnual[r, p, i, t, v, o])
 
-    period_emission_cost = var_emissions + var_annual_emissions
+    # 5. flex annual emissions -- removed (double counting)
 
-    period_costs = (
-        loan_costs + fixed_costs + variable_costs + variable_costs_annual + period_emission_cost
-    )
-    return period_costs
+    return coefs, cost_vars
 
 
 # ---------------------------------------------------------------
@@ -621,25 +675,25 @@ def Demand_Constraint(M: 'TemoaModel', r, p, s, d, dem):
     could satisfy both an end-use and internal system demand, then the output from
     :math:`\textbf{FO}` and :math:`\textbf{FOA}` would be double counted."""
 
-    supply = sum(
-        M.V_FlowOut[r, p, s, d, S_i, S_t, S_v, dem]
-        for S_t, S_v in M.commodityUStreamProcess[r, p, dem]
-        if S_t not in M.tech_annual
-        for S_i in M.ProcessInputsByOutput[r, p, S_t, S_v, dem]
-    )
-
-    supply_annual = sum(
-        M.V_FlowOutAnnual[r, p, S_i, S_t, S_v, dem]
-        for S_t, S_v in M.commodityUStreamProcess[r, p, dem]
-        if S_t in M.tech_annual
-        for S_i in M.ProcessInputsByOutput[r, p, S_t, S_v, dem]
-    ) * value(M.SegFrac[s, d])
-
-    DemandConstraintErrorCheck(supply + supply_annual, r, p, s, d, dem)
-
-    expr = (
-        supply + supply_annual == M.Demand[r, p, dem] * M.DemandSpecificDistribution[r, s, d, dem]
-    )
+    # gather the time-sliced and the (segment fraction of the) annual flows in one pass
+    coefs = []
+    flows = []
+    for S_t, S_v in M.commodityUStreamProcessNonAnnual[r, p, dem]:
+        for S_i in M.ProcessInputsByOutput[r, p, S_t, S_v, dem]:
+            coefs.append(1)
+            flows.append(M.V_FlowOut[r, p, s, d, S_i, S_t, S_v, dem])
+    seg = M._segfrac[s, d]
+    for S_t, S_v in M.commodityUStreamProcessAnnual[r, p, dem]:
+        for S_i in M.ProcessInputsByOutput[r, p, S_t, S_v, dem]:
+            coefs.append(seg)
+            flows.append(M.V_FlowOutAnnual[r, p, S_i, S_t, S_v, dem])
+    supply = LinearExpression(constant=0, linear_coefs=coefs, linear_vars=flows) if flows else 0
+
+    DemandConstraintErrorCheck(supply, r, p, s, d, dem)
+
+    demand = M.Demand[r, p, dem]
+    distribution = M.DemandSpecificDistribution[r, s, d, dem]  # mutable, so keep the param
+    expr = supply == demand * distribution
 
     return expr
 
@@ -674,13 +728,9 @@ def DemandActivity_Constraint(M: 'TemoaModel', r, p, s, d, t, v, dem, s_0, d_0):
     and not  :math:`\textbf{FOA}`
     """
 
-    act_a = sum(
-        M.V_FlowOut[r, p, s_0, d_0, S_i, t, v, dem]
-        for S_i in M.ProcessInputsByOutput[r, p, t, v, dem]
-    )
-    act_b = sum(
-        M.V_FlowOut[r, p, s, d, S_i, t, v, dem] for S_i in M.ProcessInputsByOutput[r, p, t, v, dem]
-    )
+    inputs = M.ProcessInputsByOutput[r, p, t, v, dem]
+    act_a = quicksum(M.V_FlowOut[r, p, s_0, d_0, S_i, t, v, dem] for S_i in inputs)
+    act_b = quicksum(M.V_FlowOut[r, p, s, d, S_i, t, v, dem] for S_i in inputs)
 
     expr = (
         act_a * M.DemandSpecificDistribution[r, s, d, dem]
@@ -769,62 +819,50 @@ def CommodityBalance_Constraint(M: 'TemoaModel', r, p, s, d, c):
            &\forall \{r, p, s, d, c\} \in \Theta_{\text{CommodityBalance}}
 
     """
-    if c in M.commodity_demand:
-        return Constraint.Skip
-
-    vflow_in_ToStorage = sum(
-        M.V_FlowIn[r, p, s, d, c, S_t, S_v, S_o]
-        for S_t, S_v in M.commodityDStreamProcess[r, p, c]
-        if S_t in M.tech_storage
-        for S_o in M.ProcessOutputsByInput[r, p, S_t, S_v, c]
-    )
-
-    vflow_in_ToNonStorage = sum(
-        M.V_FlowOut[r, p, s, d, c, S_t, S_v, S_o] / value(M.Efficiency[r, c, S_t, S_v, S_o])
-        for S_t, S_v in M.commodityDStreamProcess[r, p, c]
-        if S_t not in M.tech_storage and S_t not in M.tech_annual
-        for S_o in M.ProcessOutputsByInput[r, p, S_t, S_v, c]
-    )
-
-    vflow_in_ToNonStorageAnnual = value(M.SegFrac[s, d]) * sum(
-        M.V_FlowOutAnnual[r, p, c, S_t, S_v, S_o] / value(M.Efficiency[r, c, S_t, S_v, S_o])
-        for S_t, S_v in M.commodityDStreamProcess[r, p, c]
-        if S_t not in M.tech_storage and S_t in M.tech_annual
-        for S_o in M.ProcessOutputsByInput[r, p, S_t, S_v, c]
-    )
+    # demand commodities are excluded from the index set, they are balanced by Demand_Constraint
+
+    # The consumption side is linear in the flows, so the coefficients and variables are
+    # gathered from the pre-split downstream tuples (see CreateSparseDicts) and handed to a
+    # single LinearExpression rather than summing a handful of sub-expressions.
+    coefs = []
+    flows = []
+    # flows into storage
+    for S_t, S_v, S_o, _ in M.commodityDStreamStorage[r, p, c]:
+        coefs.append(1)
+        flows.append(M.V_FlowIn[r, p, s, d, c, S_t, S_v, S_o])
+    # flows into other (non-annual) processes
+    for S_t, S_v, S_o, inv_eff in M.commodityDStreamNonAnnual[r, p, c]:
+        coefs.append(inv_eff)
+        flows.append(M.V_FlowOut[r, p, s, d, c, S_t, S_v, S_o])
+    # the time slice share of the flows into annual processes
+    seg = M._segfrac[s, d]
+    for S_t, S_v, S_o, inv_eff in M.commodityDStreamAnnual[r, p, c]:
+        coefs.append(seg * inv_eff)
+        flows.append(M.V_FlowOutAnnual[r, p, c, S_t, S_v, S_o])
 
     try:
-        vflow_out = sum(
-            M.V_FlowOut[r, p, s, d, S_i, S_t, S_v, c]
-            for S_t, S_v in M.commodityUStreamProcess[r, p, c]
-            for S_i in M.ProcessInputsByOutput[r, p, S_t, S_v, c]
+        # the upstream processes and exchanges are grouped by (r, p, c) in CreateSparseDicts
+        upstream = M.commodityUStreamInputs[r, p, c]
+        vflow_out = quicksum(
+            M.V_FlowOut[r, p, s, d, S_i, S_t, S_v, c] for S_t, S_v, S_i in upstream
         )
 
         # export of commodity c from region r to other regions
-        interregional_exports = 0
-        if (r, p, c) in M.exportRegions:
-            interregional_exports = sum(
-                M.V_FlowOut[r + '-' + reg, p, s, d, c, S_t, S_v, S_o]
-                / value(M.Efficiency[r + '-' + reg, c, S_t, S_v, S_o])
-                for reg, S_t, S_v, S_o in M.exportRegions[r, p, c]
-            )
+        for r_reg, S_t, S_v, S_o, inv_eff in M.commodityExports.get((r, p, c), ()):
+            coefs.append(inv_eff)
+            flows.append(M.V_FlowOut[r_reg, p, s, d, c, S_t, S_v, S_o])
 
         # import of commodity c from other regions into region r
-        interregional_imports = 0
-        if (r, p, c) in M.importRegions:
-            interregional_imports = sum(
-                M.V_FlowOut[reg + '-' + r, p, s, d, S_i, S_t, S_v, c]
-                for reg, S_t, S_v, S_i in M.importRegions[r, p, c]
-            )
+        interregional_imports = quicksum(
+            M.V_FlowOut[reg_r, p, s, d, S_i, S_t, S_v, c]
+            for reg_r, S_t, S_v, S_i in M.commodityImports.get((r, p, c), ())
+        )
 
-        v_out_excess = 0
         if c in M.flex_commodities:
-            v_out_excess = sum(
-                M.V_Flex[r, p, s, d, S_i, S_t, S_v, c]
-                for S_t, S_v in M.commodityUStreamProcess[r, p, c]
-                if S_t not in M.tech_storage and S_t not in M.tech_annual and S_t in M.tech_flex
-                for S_i in M.ProcessInputsByOutput[r, p, S_t, S_v, c]
-            )
+            for S_t, S_v, S_i in upstream:
+                if S_t not in M._tech_storage and S_t not in M._tech_annual and S_t in M._tech_flex:
+                    coefs.append(1)
+                    flows.append(M.V_Flex[r, p, s, d, S_i, S_t, S_v, c])
 
     except KeyError:
         raise KeyError(
@@ -836,28 +874,13 @@ def CommodityBalance_Constraint(M: 'TemoaModel', r, p, s, d, c):
       either be in tech_annual or not in tech_annual'
         )
 
-    CommodityBalanceConstraintErrorCheck(
-        vflow_out + interregional_imports,
-        vflow_in_ToStorage
-        + vflow_in_ToNonStorage
-        + vflow_in_ToNonStorageAnnual
-        + interregional_exports
-        + v_out_excess,
-        r,
-        p,
-        s,
-        d,
-        c,
-    )
+    vflow_in = LinearExpression(constant=0, linear_coefs=coefs, linear_vars=flows)
 
-    expr = (
-        vflow_out + interregional_imports
-        == vflow_in_ToStorage
-        + vflow_in_ToNonStorage
-        + vflow_in_ToNonStorageAnnual
-        + interregional_exports
-        + v_out_excess
-    )
+    # the production side is built once and shared by the error check and the constraint
+    vflow_supply = vflow_out + interregional_imports
+    CommodityBalanceConstraintErrorCheck(vflow_supply, vflow_in, r, p, s, d, c)
+
+    expr = vflow_supply == vflow_in
 
     return expr
 
@@ -894,69 +917,55 @@ def CommodityBalanceAnnual_Constraint(M: 'TemoaModel', r, p, c):
            &\forall \{r, p, c\} \in \Theta_{\text{CommodityBalanceAnnual}}
 
     """
-    if c in M.commodity_demand:
-        return Constraint.Skip
+    # demand commodities are excluded from the index set, they are balanced by Demand_Constraint
+
+    # the downstream processes (and their efficiencies) are pre-split in CreateSparseDicts.
+    # Note that the storage techs (never annual) draw on the commodity through V_FlowOut here.
+    # Each (t, v, o) contributes a flow in every time slice with the same coefficient, so the
+    # coefficients are repeated once per process and the flows gathered over the time slices.
+    # The remaining consumption terms are appended so a single LinearExpression is built.
+    time_slices = M._time_slices
+    downstream = M.commodityDStreamNonAnnual[r, p, c] + M.commodityDStreamStorage[r, p, c]
+    coefs = [inv_eff for *_, inv_eff in downstream for _ in time_slices]
+    flows = [
+        M.V_FlowOut[r, p, s, d, c, S_t, S_v, S_o]
+        for S_t, S_v, S_o, _ in downstream
+        for s, d in time_slices
+    ]
 
-    vflow_in = sum(
-        M.V_FlowOut[r, p, s, d, c, S_t, S_v, S_o] / value(M.Efficiency[r, c, S_t, S_v, S_o])
-        for S_t, S_v in M.commodityDStreamProcess[r, p, c]
-        if S_t not in M.tech_annual
-        for S_o in M.ProcessOutputsByInput[r, p, S_t, S_v, c]
-        for d in M.time_of_day
-        for s in M.time_season
-    )
+    # flows into annual processes
+    for S_t, S_v, S_o, inv_eff in M.commodityDStreamAnnual[r, p, c]:
+        coefs.append(inv_eff)
+        flows.append(M.V_FlowOutAnnual[r, p, c, S_t, S_v, S_o])
 
-    vflow_in_annual = sum(
-        M.V_FlowOutAnnual[r, p, c, S_t, S_v, S_o] / value(M.Efficiency[r, c, S_t, S_v, S_o])
-        for S_t, S_v in M.commodityDStreamProcess[r, p, c]
-        if S_t in M.tech_annual
-        for S_o in M.ProcessOutputsByInput[r, p, S_t, S_v, c]
-    )
-
-    vflow_out = sum(
-        M.V_FlowOutAnnual[r, p, S_i, S_t, S_v, c]
-        for S_t, S_v in M.commodityUStreamProcess[r, p, c]
-        for S_i in M.ProcessInputsByOutput[r, p, S_t, S_v, c]
-    )
+    # the upstream processes and exchanges are grouped by (r, p, c) in CreateSparseDicts
+    upstream = M.commodityUStreamInputs[r, p, c]
+    vflow_out = quicksum(M.V_FlowOutAnnual[r, p, S_i, S_t, S_v, c] for S_t, S_v, S_i in upstream)
 
     # export of commodity c from region r to other regions
-    interregional_exports = 0
-    if (r, p, c) in M.exportRegions:
-        interregional_exports = sum(
-            M.V_FlowOutAnnual[str(r) + '-' + str(reg), p, c, S_t, S_v, S_o]
-            / value(M.Efficiency[str(r) + '-' + str(reg), c, S_t, S_v, S_o])
-            for reg, S_t, S_v, S_o in M.exportRegions[r, p, c]
-        )
+    for r_reg, S_t, S_v, S_o, inv_eff in M.commodityExports.get((r, p, c), ()):
+        coefs.append(inv_eff)
+        flows.append(M.V_FlowOutAnnual[r_reg, p, c, S_t, S_v, S_o])
 
     # import of commodity c from other regions into region r
-    interregional_imports = 0
-    if (r, p, c) in M.importRegions:
-        interregional_imports = sum(
-            M.V_FlowOutAnnual[str(reg) + '-' + str(r), p, S_i, S_t, S_v, c]
-            for reg, S_t, S_v, S_i in M.importRegions[r, p, c]
-        )
+    interregional_imports = quicksum(
+        M.V_FlowOutAnnual[reg_r, p, S_i, S_t, S_v, c]
+        for reg_r, S_t, S_v, S_i in M.commodityImports.get((r, p, c), ())
+    )
 
-    v_out_excess = 0
     if c in M.flex_commodities:
-        v_out_excess = sum(
-            M.V_FlexAnnual[r, p, S_i, S_t, S_v, c]
-            for S_t, S_v in M.commodityUStreamProcess[r, p, c]
-            if S_t in M.tech_flex and S_t in M.tech_annual
-            for S_i in M.ProcessInputsByOutput[r, p, S_t, S_v, c]
-        )
+        for S_t, S_v, S_i in upstream:
+            if S_t in M._tech_flex and S_t in M._tech_annual:
+                coefs.append(1)
+                flows.append(M.V_FlexAnnual[r, p, S_i, S_t, S_v, c])
 
-    CommodityBalanceConstraintErrorCheckAnnual(
-        vflow_out + interregional_imports,
-        vflow_in_annual + vflow_in + interregional_exports + v_out_excess,
-        r,
-        p,
-        c,
-    )
+    vflow_in = LinearExpression(constant=0, linear_coefs=coefs, linear_vars=flows)
 
-    expr = (
-        vflow_out + interregional_imports
-        == vflow_in_annual + vflow_in + interregional_exports + v_out_excess
-    )
+    # the production side is built once and shared by the error check and the constraint
+    vflow_supply = vflow_out + interregional_imports
+    CommodityBalanceConstraintErrorCheckAnnual(vflow_supply, vflow_in, r, p, c)
+
+    expr = vflow_supply == vflow_in
 
     return expr
 
@@ -986,22 +995,24 @@ def ResourceExtraction_Constraint(M: 'TemoaModel', reg, p, r):
     )
     # dev note:  This constraint does not have a table in the current schema
     #            Additionally, the below (incorrect) construct assumes that a resource cannot be used
-    #            by BOTH a non-annual and annual tech.  It should be re-written to add these
-    try:
-        collected = sum(
-            M.V_FlowOut[reg, p, S_s, S_d, S_i, S_t, S_v, r]
-            for S_i, S_t, S_v in M.ProcessByPeriodAndOutput.keys()
-            for S_s in M.time_season
-            for S_d in M.time_of_day
-        )
-    except KeyError:
-        collected = sum(
-            M.V_FlowOutAnnual[reg, p, S_i, S_t, S_v, r]
-            for S_i, S_t, S_v in M.ProcessByPeriodAndOutput.keys()
-        )
-
-    expr = collected <= M.ResourceBound[reg, p, r]
-    return expr
+    #            by BOTH a non-annual and annual tech.  It should be re-written to add these.
+    #            Until then, skip it rather than building the (large) sum.
+    return Constraint.Skip
+    # try:
+    #     collected = sum(
+    #         M.V_FlowOut[reg, p, S_s, S_d, S_i, S_t, S_v, r]
+    #         for S_i, S_t, S_v in M.ProcessByPeriodAndOutput.keys()
+    #         for S_s in M.time_season
+    #         for S_d in M.time_of_day
+    #     )
+    # except KeyError:
+    #     collected = sum(
+    #         M.V_FlowOutAnnual[reg, p, S_i, S_t, S_v, r]
+    #         for S_i, S_t, S_v in M.ProcessByPeriodAndOutput.keys()
+    #     )
+    #
+    # expr = collected <= M.ResourceBound[reg, p, r]
+    # return expr
 
 
 def BaseloadDiurnal_Constraint(M: 'TemoaModel', r, p, s, d, t, v):
@@ -1031,16 +1042,11 @@ def BaseloadDiurnal_Constraint(M: 'TemoaModel', r, p, s, d, t, v):
     """
     # Question: How to set the different times of day equal to each other?
 
-    # Step 1: Acquire a "canonical" representation of the times of day
-    l_times = sorted(M.time_of_day)  # i.e. a sorted Python list.
-    # This is the commonality between invocations of this method.
-
-    index = l_times.index(d)
-    if 0 == index:
-        # When index is 0, it means that we've reached the beginning of the array
-        # For the algorithm, this is a terminating condition: do not create
-        # an effectively useless constraint
-        return Constraint.Skip
+    # Step 1: Acquire a "canonical" first time of day (the first when sorted).
+    # This is the commonality between invocations of this method, so it is cached.
+    # The first time of day itself is left out of the index set (it would be an
+    # effectively useless constraint), see BaseloadDiurnalConstraintIndices.
+    d_0 = M._tod_sorted_first
 
     # Step 2: Set the rest of the times of day equal in output to the first.
     # i.e. create a set of constraints that look something like:
@@ -1048,7 +1054,6 @@ def BaseloadDiurnal_Constraint(M: 'TemoaModel', r, p, s, d, t, v):
     # tod[ 3 ] == tod[ 1 ]
     # tod[ 4 ] == tod[ 1 ]
     # and so on ...
-    d_0 = l_times[0]
 
     # Step 3: the actual expression.  For baseload, must compute the /average/
     # activity over the segment.  By definition, average is
@@ -1056,19 +1061,22 @@ def BaseloadDiurnal_Constraint(M: 'TemoaModel', r, p, s, d, t, v):
     # So:   (ActA / SegA) == (ActB / SegB)
     #   computationally, however, multiplication is cheaper than division, so:
     #       (ActA * SegB) == (ActB * SegA)
-    activity_sd = sum(
-        M.V_FlowOut[r, p, s, d, S_i, t, v, S_o]
-        for S_i in M.processInputs[r, p, t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
+    # The segment fractions are folded into the flow coefficients, so each side is a single
+    # linear sum rather than a product wrapped around a sum.
+    io_pairs = M.processIOPairs[r, p, t, v]
+    activity_sd = LinearExpression(
+        constant=0,
+        linear_coefs=[M._segfrac[s, d_0]] * len(io_pairs),
+        linear_vars=[M.V_FlowOut[r, p, s, d, S_i, t, v, S_o] for S_i, S_o in io_pairs],
     )
 
-    activity_sd_0 = sum(
-        M.V_FlowOut[r, p, s, d_0, S_i, t, v, S_o]
-        for S_i in M.processInputs[r, p, t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
+    activity_sd_0 = LinearExpression(
+        constant=0,
+        linear_coefs=[M._segfrac[s, d]] * len(io_pairs),
+        linear_vars=[M.V_FlowOut[r, p, s, d_0, S_i, t, v, S_o] for S_i, S_o in io_pairs],
     )
 
-    expr = activity_sd * M.SegFrac[s, d_0] == activity_sd_0 * M.SegFrac[s, d]
+    expr = activity_sd == activity_sd_0
 
     return expr
 
@@ -1090,7 +1098,10 @@ def RegionalExchangeCapacity_Constraint(M: 'TemoaModel', r_e, r_i, p, t, v):
           \forall \{r_e, r_i, t, v\} \in \Theta_{\text{RegionalExchangeCapacity}}
     """
 
-    expr = M.V_Capacity[r_e + '-' + r_i, p, t, v] == M.V_Capacity[r_i + '-' + r_e, p, t, v]
+    expr = (
+        M.V_Capacity[M._exchange_key[r_e, r_i], p, t, v]
+        == M.V_Capacity[M._exchange_key[r_i, r_e], p, t, v]
+    )
 
     return expr
 
@@ -1150,51 +1161,33 @@ def StorageEnergy_Constraint(M: 'TemoaModel', r, p, s, d, t, v):
     .. math::
           \forall \{r, p, s, d, t, v\} \in \Theta_{\text{StorageEnergy}}
     """
-    # This is the sum of all input=i sent TO storage tech t of vintage v with
-    # output=o in p,s,d
-    charge = sum(
-        M.V_FlowIn[r, p, s, d, S_i, t, v, S_o] * M.Efficiency[r, S_i, t, v, S_o]
-        for S_i in M.processInputs[r, p, t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
-    )
-
-    # This is the sum of all output=o withdrawn FROM storage tech t of vintage v
-    # with input=i in p,s,d
-    discharge = sum(
-        M.V_FlowOut[r, p, s, d, S_i, t, v, S_o]
-        for S_o in M.processOutputs[r, p, t, v]
-        for S_i in M.ProcessInputsByOutput[r, p, t, v, S_o]
-    )
+    # The charge is the sum of all input=i sent TO storage tech t of vintage v with
+    # output=o in p,s,d and the discharge is the sum of all output=o withdrawn FROM it
+    charge, discharge = storage_flows(M, r, p, s, d, t, v)
 
     stored_energy = charge - discharge
 
     # This storage formulation allows stored energy to carry over through
     # time of day and seasons, but must be zeroed out at the end of each period, i.e.,
-    # the last time slice of the last season must zero out
-    if d == M.time_of_day.last() and s == M.time_season.last():
-        d_prev = M.time_of_day.prev(d)
-        expr = M.V_StorageLevel[r, p, s, d_prev, t, v] + stored_energy == M.V_StorageInit[r, t, v]
+    # the last time slice of the last season must zero out.  The predecessor of each
+    # time slice (the previous time of day, or the last one of the previous season)
+    # is cached in M._slice_prev.
+    if (s, d) == M._slice_last:
+        s_prev, d_prev = M._slice_prev[s, d]
+        expr = (
+            M.V_StorageLevel[r, p, s_prev, d_prev, t, v] + stored_energy == M.V_StorageInit[r, t, v]
+        )
 
     # First time slice of the first season (i.e., start of period), starts at StorageInit level
-    elif d == M.time_of_day.first() and s == M.time_season.first():
+    elif (s, d) not in M._slice_prev:
         expr = M.V_StorageLevel[r, p, s, d, t, v] == M.V_StorageInit[r, t, v] + stored_energy
 
-    # First time slice of any season that is NOT the first season
-    elif d == M.time_of_day.first():
-        d_last = M.time_of_day.last()
-        s_prev = M.time_season.prev(s)
-        expr = (
-            M.V_StorageLevel[r, p, s, d, t, v]
-            == M.V_StorageLevel[r, p, s_prev, d_last, t, v] + stored_energy
-        )
-
-    # Any time slice that is NOT covered above (i.e., not the time slice ending
-    # the period, or the first time slice of any season)
+    # Any other time slice carries over from the one before it
     else:
-        d_prev = M.time_of_day.prev(d)
+        s_prev, d_prev = M._slice_prev[s, d]
         expr = (
             M.V_StorageLevel[r, p, s, d, t, v]
-            == M.V_StorageLevel[r, p, s, d_prev, t, v] + stored_energy
+            == M.V_StorageLevel[r, p, s_prev, d_prev, t, v] + stored_energy
         )
 
     return expr
@@ -1229,19 +1222,50 @@ def StorageEnergyUpperBound_Constraint(M: 'TemoaModel', r, p, s, d, t, v):
 
     """
 
-    energy_capacity = (
-        M.V_Capacity[r, p, t, v]
-        * M.CapacityToActivity[r, t]
+    # all of the factors are constants, so they are folded into a single coefficient
+    energy_per_capacity = (
+        M._cap2act[r, t]
         * (M.StorageDuration[r, t] / 8760)
         * M.SegFracPerSeason[s]
         * 365
-        * value(M.ProcessLifeFrac[r, p, t, v])
+        * M._plf[r, p, t, v]
     )
+    energy_capacity = M.V_Capacity[r, p, t, v] * energy_per_capacity
     expr = M.V_StorageLevel[r, p, s, d, t, v] <= energy_capacity
 
     return expr
 
 
+def storage_flows(M: 'TemoaModel', r, p, s, d, t, v, release=False):
+    """
+    The charge and discharge of a storage process in a time slice.  These are used by the
+    StorageEnergy, StorageChargeRate, StorageDischargeRate, and StorageThroughput constraints,
+    so they are built once per index and held in M._storage_flows until released.
+    :param release: drop the held expressions after this call
+    :return: tuple of (charge, discharge) expressions
+    """
+    key = (r, p, s, d, t, v)
+    flows = M._storage_flows.pop(key, None) if release else M._storage_flows.get(key)
+    if flows is None:
+        io_pairs = M.processIOPairs[r, p, t, v]
+        charge = quicksum(
+            M.V_FlowIn[r, p, s, d, S_i, t, v, S_o] * M._eff[r, S_i, t, v, S_o]
+            for S_i, S_o in io_pairs
+        )
+        discharge = quicksum(M.V_FlowOut[r, p, s, d, S_i, t, v, S_o] for S_i, S_o in io_pairs)
+        flows = (charge, discharge)
+        if not release:
+            M._storage_flows[key] = flows
+    return flows
+
+
+def storage_max_rate(M: 'TemoaModel', r, p, s, d, t, v):
+    """
+    The maximum charge / discharge / throughput of a storage process in a time slice
+    """
+    return M.V_Capacity[r, p, t, v] * (M._cap2act[r, t] * M._segfrac[s, d] * M._plf[r, p, t, v])
+
+
 def StorageChargeRate_Constraint(M: 'TemoaModel', r, p, s, d, t, v):
     r"""
 
@@ -1260,19 +1284,10 @@ def StorageChargeRate_Constraint(M: 'TemoaModel', r, p, s, d, t, v):
 
     """
     # Calculate energy charge in each time slice
-    slice_charge = sum(
-        M.V_FlowIn[r, p, s, d, S_i, t, v, S_o] * M.Efficiency[r, S_i, t, v, S_o]
-        for S_i in M.processInputs[r, p, t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
-    )
+    slice_charge, _ = storage_flows(M, r, p, s, d, t, v)
 
     # Maximum energy charge in each time slice
-    max_charge = (
-        M.V_Capacity[r, p, t, v]
-        * M.CapacityToActivity[r, t]
-        * M.SegFrac[s, d]
-        * value(M.ProcessLifeFrac[r, p, t, v])
-    )
+    max_charge = storage_max_rate(M, r, p, s, d, t, v)
 
     # Energy charge cannot exceed the power capacity of the storage unit
     expr = slice_charge <= max_charge
@@ -1297,19 +1312,10 @@ def StorageDischargeRate_Constraint(M: 'TemoaModel', r, p, s, d, t, v):
           \forall \{r,p, s, d, t, v\} \in \Theta_{\text{StorageDischargeRate}}
     """
     # Calculate energy discharge in each time slice
-    slice_discharge = sum(
-        M.V_FlowOut[r, p, s, d, S_i, t, v, S_o]
-        for S_o in M.processOutputs[r, p, t, v]
-        for S_i in M.ProcessInputsByOutput[r, p, t, v, S_o]
-    )
+    _, slice_discharge = storage_flows(M, r, p, s, d, t, v)
 
     # Maximum energy discharge in each time slice
-    max_discharge = (
-        M.V_Capacity[r, p, t, v]
-        * M.CapacityToActivity[r, t]
-        * M.SegFrac[s, d]
-        * value(M.ProcessLifeFrac[r, p, t, v])
-    )
+    max_discharge = storage_max_rate(M, r, p, s, d, t, v)
 
     # Energy discharge cannot exceed the capacity of the storage unit
     expr = slice_discharge <= max_discharge
@@ -1336,25 +1342,11 @@ def StorageThroughput_Constraint(M: 'TemoaModel', r, p, s, d, t, v):
           \\
           \forall \{r, p, s, d, t, v\} \in \Theta_{\text{StorageThroughput}}
     """
-    discharge = sum(
-        M.V_FlowOut[r, p, s, d, S_i, t, v, S_o]
-        for S_o in M.processOutputs[r, p, t, v]
-        for S_i in M.ProcessInputsByOutput[r, p, t, v, S_o]
-    )
-
-    charge = sum(
-        M.V_FlowIn[r, p, s, d, S_i, t, v, S_o] * M.Efficiency[r, S_i, t, v, S_o]
-        for S_i in M.processInputs[r, p, t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
-    )
+    # this is the last of the storage constraints to use the flows, so release them
+    charge, discharge = storage_flows(M, r, p, s, d, t, v, release=True)
 
     throughput = charge + discharge
-    max_throughput = (
-        M.V_Capacity[r, p, t, v]
-        * M.CapacityToActivity[r, t]
-        * M.SegFrac[s, d]
-        * value(M.ProcessLifeFrac[r, p, t, v])
-    )
+    max_throughput = storage_max_rate(M, r, p, s, d, t, v)
     expr = throughput <= max_throughput
     return expr
 
@@ -1407,11 +1399,34 @@ def StorageInit_Constraint(M: 'TemoaModel', r, t, v):
     return expr
 
 
+def ramp_activity_change(M: 'TemoaModel', r, p, t, v, s, d, s_prev, d_prev, ramp):
+    """
+    The change in the activity of a process, per unit of time slice length and of
+    capacity-to-activity, from time slice (s_prev, d_prev) to (s, d), less the ramp limit
+    (ramp * capacity).  The constants are folded into the coefficients instead of dividing
+    the flow sums by them, so the whole constraint body is a single linear expression.
+    """
+    io_pairs = M.processIOPairs[r, p, t, v]
+    c2a_inv = 1 / M._cap2act[r, t]
+    coef = M._segfrac_inv[s, d] * c2a_inv
+    coef_prev = -M._segfrac_inv[s_prev, d_prev] * c2a_inv
+    # both time slices' flows are gathered in the one pass over the input/output pairs
+    flows = []
+    flows_prev = []
+    for S_i, S_o in io_pairs:
+        flows.append(M.V_FlowOut[r, p, s, d, S_i, t, v, S_o])
+        flows_prev.append(M.V_FlowOut[r, p, s_prev, d_prev, S_i, t, v, S_o])
+    return LinearExpression(
+        constant=0,
+        linear_coefs=[coef] * len(flows) + [coef_prev] * len(flows_prev) + [-ramp],
+        linear_vars=flows + flows_prev + [M.V_Capacity[r, p, t, v]],
+    )
+
+
 def RampUpDay_Constraint(M: 'TemoaModel', r, p, s, d, t, v):
-    # M.time_of_day is a sorted set, and M.time_of_day.first() returns the first
-    # element in the set, similarly, M.time_of_day.last() returns the last element.
-    # M.time_of_day.prev(d) function will return the previous element before s, and
-    # M.time_of_day.next(d) function will return the next element after s.
+    # M.time_of_day is a sorted set.  M._tod_first is the first element in the set, and
+    # M._tod_prev[d] is the element before d.  Both are cached from the set in
+    # CreateTimeSliceTables.
 
     r"""
 
@@ -1454,27 +1469,10 @@ def RampUpDay_Constraint(M: 'TemoaModel', r, p, s, d, t, v):
           \\
           \forall \{r, p, s, d, t, v\} \in \Theta_{\text{RampUpDay}}
     """
-    if d != M.time_of_day.first():
-        d_prev = M.time_of_day.prev(d)
-        activity_sd_prev = sum(
-            M.V_FlowOut[r, p, s, d_prev, S_i, t, v, S_o]
-            for S_i in M.processInputs[r, p, t, v]
-            for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
-        )
-
-        activity_sd = sum(
-            M.V_FlowOut[r, p, s, d, S_i, t, v, S_o]
-            for S_i in M.processInputs[r, p, t, v]
-            for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
-        )
-
-        expr_left = (
-            activity_sd / value(M.SegFrac[s, d]) - activity_sd_prev / value(M.SegFrac[s, d_prev])
-        ) / value(M.CapacityToActivity[r, t])
-        expr_right = M.V_Capacity[r, p, t, v] * value(M.RampUp[r, t])
-        expr = expr_left <= expr_right
-    else:
-        return Constraint.Skip
+    # the first time of day is excluded from the index set, see RampConstraintDayIndices
+    d_prev = M._tod_prev[d]
+    # the change in activity less the allowed ramp up (RampUp * CAPAVL)
+    expr = ramp_activity_change(M, r, p, t, v, s, d, s, d_prev, M.RampUp[r, t]) <= 0
 
     return expr
 
@@ -1504,27 +1502,10 @@ def RampDownDay_Constraint(M: 'TemoaModel', r, p, s, d, t, v):
           \\
           \forall \{r, p, s, d, t, v\} \in \Theta_{\text{RampDownDay}}
     """
-    if d != M.time_of_day.first():
-        d_prev = M.time_of_day.prev(d)
-        activity_sd_prev = sum(
-            M.V_FlowOut[r, p, s, d_prev, S_i, t, v, S_o]
-            for S_i in M.processInputs[r, p, t, v]
-            for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
-        )
-
-        activity_sd = sum(
-            M.V_FlowOut[r, p, s, d, S_i, t, v, S_o]
-            for S_i in M.processInputs[r, p, t, v]
-            for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
-        )
-
-        expr_left = (
-            activity_sd / value(M.SegFrac[s, d]) - activity_sd_prev / value(M.SegFrac[s, d_prev])
-        ) / value(M.CapacityToActivity[r, t])
-        expr_right = -(M.V_Capacity[r, p, t, v] * value(M.RampDown[r, t]))
-        expr = expr_left >= expr_right
-    else:
-        return Constraint.Skip
+    # the first time of day is excluded from the index set, see RampConstraintDayIndices
+    d_prev = M._tod_prev[d]
+    # the change in activity plus the allowed ramp down (RampDown * CAPAVL)
+    expr = ramp_activity_change(M, r, p, t, v, s, d, s, d_prev, -M.RampDown[r, t]) >= 0
 
     return expr
 
@@ -1554,29 +1535,13 @@ def RampUpSeason_Constraint(M: 'TemoaModel', r, p, s, t, v):
           \\
           \forall \{r, p, s, t, v\} \in \Theta_{\text{RampUpSeason}}
     """
-    if s != M.time_season.first():
-        s_prev = M.time_season.prev(s)
-        d_first = M.time_of_day.first()
-        d_last = M.time_of_day.last()
+    if s != M._season_first:
+        s_prev = M._season_prev[s]
+        d_first = M._tod_first
+        d_last = M._tod_last
 
-        activity_sd_first = sum(
-            M.V_FlowOut[r, p, s, d_first, S_i, t, v, S_o]
-            for S_i in M.processInputs[r, p, t, v]
-            for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
-        )
-
-        activity_s_prev_d_last = sum(
-            M.V_FlowOut[r, p, s_prev, d_last, S_i, t, v, S_o]
-            for S_i in M.processInputs[r, p, t, v]
-            for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
-        )
-
-        expr_left = (
-            activity_sd_first / M.SegFrac[s, d_first]
-            - activity_s_prev_d_last / M.SegFrac[s_prev, d_last]
-        ) / value(M.CapacityToActivity[r, t])
-        expr_right = M.V_Capacity[r, p, t, v] * value(M.RampUp[r, t])
-        expr = expr_left <= expr_right
+        # the change in activity less the allowed ramp up (RampUp * CAPAVL)
+        expr = ramp_activity_change(M, r, p, t, v, s, d_first, s_prev, d_last, M.RampUp[r, t]) <= 0
     else:
         return Constraint.Skip
 
@@ -1609,86 +1574,44 @@ def RampDownSeason_Constraint(M: 'TemoaModel', r, p, s, t, v):
           \\
           \forall \{r, p, s, t, v\} \in \Theta_{\text{RampDownSeason}}
     """
-    if s != M.time_season.first():
-        s_prev = M.time_season.prev(s)
-        d_first = M.time_of_day.first()
-        d_last = M.time_of_day.last()
+    if s != M._season_first:
+        s_prev = M._season_prev[s]
+        d_first = M._tod_first
+        d_last = M._tod_last
 
-        activity_sd_first = sum(
-            M.V_FlowOut[r, p, s, d_first, S_i, t, v, S_o]
-            for S_i in M.processInputs[r, p, t, v]
-            for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
-        )
-
-        activity_s_prev_d_last = sum(
-            M.V_FlowOut[r, p, s_prev, d_last, S_i, t, v, S_o]
-            for S_i in M.processInputs[r, p, t, v]
-            for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
+        # the change in activity plus the allowed ramp down (RampDown * CAPAVL)
+        expr = (
+            ramp_activity_change(M, r, p, t, v, s, d_first, s_prev, d_last, -M.RampDown[r, t]) >= 0
         )
-
-        expr_left = (
-            activity_sd_first / value(M.SegFrac[s, d_first])
-            - activity_s_prev_d_last / value(M.SegFrac[s_prev, d_last])
-        ) / value(M.CapacityToActivity[r, t])
-        expr_right = -(M.V_Capacity[r, p, t, v] * value(M.RampDown[r, t]))
-        expr = expr_left >= expr_right
     else:
         return Constraint.Skip
 
     return expr
 
 
-def RampUpPeriod_Constraint(M: 'TemoaModel', r, p, t, v):
-    # if p != M.time_future.first():
-    # 	p_prev  = M.time_future.prev(p)
-    # 	s_first = M.time_season.first()
-    # 	s_last  = M.time_season.last()
-    # 	d_first = M.time_of_day.first()
-    # 	d_last  = M.time_of_day.last()
-    # 	expr_left = (
-    # 		M.V_Activity[ p, s_first, d_first, t, v ] -
-    # 		M.V_Activity[ p_prev, s_last, d_last, t, v ]
-    # 		)
-    # 	expr_right = (
-    # 		M.V_Capacity[t, v]*
-    # 		value( M.RampUp[t] )*
-    # 		value( M.CapacityToActivity[ t ] )*
-    # 		value( M.SegFrac[s, d])
-    # 		)
-    # 	expr = (expr_left <= expr_right)
-    # else:
-    # 	return Constraint.Skip
-
-    # return expr
-
-    return Constraint.Skip  # We don't need inter-period ramp up/down constraint.
-
-
-def RampDownPeriod_Constraint(M: 'TemoaModel', r, p, t, v):
-    # if p != M.time_future.first():
-    # 	p_prev  = M.time_future.prev(p)
-    # 	s_first = M.time_season.first()
-    # 	s_last  = M.time_season.last()
-    # 	d_first = M.time_of_day.first()
-    # 	d_last  = M.time_of_day.last()
-    # 	expr_left = (
-    # 		M.V_Activity[ p, s_first, d_first, t, v ] -
-    # 		M.V_Activity[ p_prev, s_last, d_last, t, v ]
-    # 		)
-    # 	expr_right = (
-    # 		-1*
-    # 		M.V_Capacity[t, v]*
-    # 		value( M.RampDown[t] )*
-    # 		value( M.CapacityToActivity[ t ] )*
-    # 		value( M.SegFrac[s, d])
-    # 		)
-    # 	expr = (expr_left >= expr_right)
-    # else:
-    # 	return Constraint.Skip
-
-    # return expr
-
-    return Constraint.Skip  # We don't need inter-period ramp up/down constraint.
+def reserve_capacity(M: 'TemoaModel', r, p):
+    """
+    The firm capacity of the reserve techs of region r (which may be an exchange region) in
+    period p.  These are the same in every time slice, so they are built once per (r, p) and
+    held in M._reserve_capacity.
+    :return: tuple of (array of CapacityCredit * PLF * C2A, list of capacity variables)
+    """
+    terms = M._reserve_capacity.get((r, p))
+    if terms is None:
+        # processReservePeriods already holds the active reserve (t, v) of each (r, p)
+        rtv = [
+            (t, v)
+            for t, v in M.processReservePeriods.get((r, p), ())
+            # Make sure (r,p,t,v) combinations are defined
+            if (r, p, t, v) in M.activeCapacityAvailable_rptv
+        ]
+        # these params are not mutable, so indexing them already returns plain numbers
+        capacity_credit = np.array([M.CapacityCredit[r, p, t, v] for t, v in rtv], dtype=float)
+        plf = np.array([M._plf[r, p, t, v] for t, v in rtv], dtype=float)
+        c2a = np.array([M._cap2act[r, t] for t, v in rtv], dtype=float)
+        terms = (capacity_credit * plf * c2a, [M.V_Capacity[r, p, t, v] for t, v in rtv])
+        M._reserve_capacity[r, p] = terms
+    return terms
 
 
 def ReserveMargin_Constraint(M: 'TemoaModel', r, p, s, d):
@@ -1719,18 +1642,13 @@ def ReserveMargin_Constraint(M: 'TemoaModel', r, p, s, d):
     ):  # If reserve set empty or if r,p not in M.processReservePeriod.keys(), skip the constraint
         return Constraint.Skip
 
-    cap_avail = sum(
-        value(M.CapacityCredit[r, p, t, v])
-        * M.ProcessLifeFrac[r, p, t, v]
-        * M.V_Capacity[r, p, t, v]
-        * value(M.CapacityToActivity[r, t])
-        * value(M.SegFrac[s, d])
-        for t in M.tech_reserve
-        if (r, p, t) in M.processVintages.keys()
-        for v in M.processVintages[r, p, t]
-        # Make sure (r,p,t,v) combinations are defined
-        if (r, p, t, v) in M.activeCapacityAvailable_rptv
-    )
+    # Both sides are linear, so they are gathered as (coefficient, variable) lists.  The
+    # capacity terms only differ between time slices by the segment fraction, which scales
+    # the coefficient array from reserve_capacity.
+    seg = M._segfrac[s, d]
+    capacity_factors, cap_vars = reserve_capacity(M, r, p)
+    cap_coefs = (capacity_factors * seg).tolist()
+    cap_vars = list(cap_vars)
 
     # The above code does not consider exchange techs, e.g. electricity
     # transmission between two distinct regions.
@@ -1739,84 +1657,72 @@ def ReserveMargin_Constraint(M: 'TemoaModel', r, p, s, d):
     # defined: once for region "Ri-Rj" and once for region "Rj-Ri".
 
     # First, determine the amount of firm capacity each exchange tech
-    # contributes.
-    for r1r2 in M.RegionalIndices:
-        if '-' not in r1r2:
-            continue
-        r1, r2 = r1r2.split('-')
-
-        # Only consider the capacity of technologies that import to
-        # the region in question -- i.e. for cases where r2 == r.
-        if r2 != r:
-            continue
-
+    # contributes.  Only consider the capacity of technologies that import to
+    # the region in question -- i.e. for cases where r2 == r.
+    for r1r2 in M._exchange_into.get(r, ()):
         # add the available capacity of the exchange tech.
-        cap_avail += sum(
-            value(M.CapacityCredit[r1r2, p, t, v])
-            * M.ProcessLifeFrac[r1r2, p, t, v]
-            * M.V_Capacity[r1r2, p, t, v]
-            * value(M.CapacityToActivity[r1r2, t])
-            * value(M.SegFrac[s, d])
-            for t in M.tech_reserve
-            if (r1r2, p, t) in M.processVintages.keys()
-            for v in M.processVintages[r1r2, p, t]
-            # Make sure (r,p,t,v) combinations are defined
-            if (r1r2, p, t, v) in M.activeCapacityAvailable_rptv
-        )
+        capacity_factors, capacities = reserve_capacity(M, r1r2, p)
+        cap_coefs.extend((capacity_factors * seg).tolist())
+        cap_vars.extend(capacities)
+
+    cap_avail = LinearExpression(constant=0, linear_coefs=cap_coefs, linear_vars=cap_vars)
 
     # In most Temoa input databases, demand is endogenous, so we use electricity
     # generation instead as a proxy for electricity demand.
-    total_generation = sum(
-        M.V_FlowOut[r, p, s, d, S_i, t, S_v, S_o]
-        for (t, S_v) in M.processReservePeriods[r, p]
-        for S_i in M.processInputs[r, p, t, S_v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, S_v, S_i]
-    )
-
-    # We must take into account flows into storage technologies.
-    # Flows into storage technologies need to be subtracted from the
-    # load calculation.
-    total_generation -= sum(
-        M.V_FlowIn[r, p, s, d, S_i, t, S_v, S_o]
-        for (t, S_v) in M.processReservePeriods[r, p]
-        if t in M.tech_storage
-        for S_i in M.processInputs[r, p, t, S_v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, S_v, S_i]
-    )
+    gen_coefs = []
+    gen_vars = []
+    for t, S_v in M.processReservePeriods[r, p]:
+        for S_i, S_o in M.processIOPairs[r, p, t, S_v]:
+            gen_coefs.append(1)
+            gen_vars.append(M.V_FlowOut[r, p, s, d, S_i, t, S_v, S_o])
+            # We must take into account flows into storage technologies.
+            # Flows into storage technologies need to be subtracted from the
+            # load calculation.
+            if t in M._tech_storage:
+                gen_coefs.append(-1)
+                gen_vars.append(M.V_FlowIn[r, p, s, d, S_i, t, S_v, S_o])
 
     # Electricity imports and exports via exchange techs are accounted
-    # for below:
-    for r1r2 in M.RegionalIndices:  # ensure the region is of the form r1-r2
-        if '-' not in r1r2:
+    # for below (the exchange regions are pre-grouped in CreateExchangeMaps):
+    # First, determine the exports, and subtract this value from the
+    # total generation.
+    for r1r2 in M._exchange_from.get(r, ()):
+        if (r1r2, p) not in M.processReservePeriods:  # ensure the technology in question exists
             continue
+        for t, S_v in M.processReservePeriods[r1r2, p]:
+            for S_i, S_o in M.processIOPairs[r1r2, p, t, S_v]:
+                gen_coefs.append(-M._eff_inv[r1r2, S_i, t, S_v, S_o])
+                gen_vars.append(M.V_FlowOut[r1r2, p, s, d, S_i, t, S_v, S_o])
+    # Second, determine the imports, and add this value from the
+    # total generation.
+    for r1r2 in M._exchange_into.get(r, ()):
         if (r1r2, p) not in M.processReservePeriods:  # ensure the technology in question exists
             continue
-        r1, r2 = r1r2.split('-')
-        # First, determine the exports, and subtract this value from the
-        # total generation.
-        if r1 == r:
-            total_generation -= sum(
-                M.V_FlowOut[r1r2, p, s, d, S_i, t, S_v, S_o]
-                / value(M.Efficiency[r1r2, S_i, t, S_v, S_o])
-                for (t, S_v) in M.processReservePeriods[r1r2, p]
-                for S_i in M.processInputs[r1r2, p, t, S_v]
-                for S_o in M.ProcessOutputsByInput[r1r2, p, t, S_v, S_i]
-            )
-        # Second, determine the imports, and add this value from the
-        # total generation.
-        elif r2 == r:
-            total_generation += sum(
-                M.V_FlowOut[r1r2, p, s, d, S_i, t, S_v, S_o]
-                for (t, S_v) in M.processReservePeriods[r1r2, p]
-                for S_i in M.processInputs[r1r2, p, t, S_v]
-                for S_o in M.ProcessOutputsByInput[r1r2, p, t, S_v, S_i]
-                if (t, S_v) in M.processReservePeriods[r1r2, p]
-            )
-
-    cap_target = total_generation * (1 + value(M.PlanningReserveMargin[r]))
+        for t, S_v in M.processReservePeriods[r1r2, p]:
+            for S_i, S_o in M.processIOPairs[r1r2, p, t, S_v]:
+                gen_coefs.append(1)
+                gen_vars.append(M.V_FlowOut[r1r2, p, s, d, S_i, t, S_v, S_o])
+
+    # the reserve margin is folded into the generation coefficients
+    reserve_factor = 1 + value(M.PlanningReserveMargin[r])
+    cap_target = LinearExpression(
+        constant=0,
+        linear_coefs=[coef * reserve_factor for coef in gen_coefs],
+        linear_vars=gen_vars,
+    )
     return cap_avail >= cap_target
 
 
+def emission_limit_skip(e, emission_limit):
+    """
+    Warn that no technology produces emission e, so its limit is skipped.
+    """
+    msg = "Warning: No technology produces emission '%s', though limit was specified as %s.\n"
+    logger.warning(msg, e, emission_limit)
+    SE.write(msg % (e, emission_limit))
+    return Constraint.Skip
+
+
 def EmissionLimit_Constraint(M: 'TemoaModel', r, p, e):
     r"""
 
@@ -1854,44 +1760,70 @@ def EmissionLimit_Constraint(M: 'TemoaModel', r, p, e):
     # if r == 'global', the constraint is system-wide
 
     regions = gather_group_regions(M=M, region=r)
+    # the regions without any activity for this emission are dropped up front, so a limit that
+    # no technology is subject to is skipped without gathering anything
+    regions = [
+        reg
+        for reg in regions
+        if (reg, e) in M._emission_activity or (reg, e) in M._emission_activity_annual
+    ]
+    if not regions:
+        return emission_limit_skip(e, emission_limit)
 
     # ================= Emissions and Flex and Curtailment =================
     # Flex flows are deducted from V_FlowOut, so it is NOT NEEDED to tax them again.  (See commodity balance constr)
     # Curtailment does not draw any inputs, so it seems logical that curtailed flows not be taxed either
 
-    actual_emissions = sum(
-        M.V_FlowOut[reg, p, S_s, S_d, S_i, S_t, S_v, S_o]
-        * M.EmissionActivity[reg, e, S_i, S_t, S_v, S_o]
-        for reg in regions
-        for tmp_r, tmp_e, S_i, S_t, S_v, S_o in M.EmissionActivity.sparse_iterkeys()
-        if tmp_e == e and tmp_r == reg and S_t not in M.tech_annual
-        # EmissionsActivity not indexed by p, so make sure (r,p,t,v) combos valid
-        if (reg, p, S_t, S_v) in M.processInputs.keys()
-        for S_s in M.time_season
-        for S_d in M.time_of_day
-    )
+    # the emission activity is a plain coefficient on each flow, so the emissions are gathered
+    # as (coefficient, flow) pairs and assembled into a single linear expression
+    # (each process's coefficient is the same in every time slice, so it is repeated in one go)
+    time_slices = M._time_slices
+    n_slices = len(time_slices)
+    coefs = []
+    flows = []
+    annual_coefs = []
+    annual_flows = []
+    # the emission activity is pre-grouped by (r, e) and split on tech_annual in CreateParamCaches
+    for reg in regions:
+        for S_i, S_t, S_v, S_o, emission_activity in M._emission_activity.get((reg, e), ()):
+            # EmissionsActivity not indexed by p, so make sure (r,p,t,v) combos valid
+            if (reg, p, S_t, S_v) not in M.processInputs:
+                continue
+            coefs.extend([emission_activity] * n_slices)
+            flows.extend(
+                M.V_FlowOut[reg, p, S_s, S_d, S_i, S_t, S_v, S_o] for S_s, S_d in time_slices
+            )
+        for S_i, S_t, S_v, S_o, emission_activity in M._emission_activity_annual.get((reg, e), ()):
+            if (reg, p, S_t, S_v) not in M.processInputs:
+                continue
+            annual_coefs.append(emission_activity)
+            annual_flows.append(M.V_FlowOutAnnual[reg, p, S_i, S_t, S_v, S_o])
 
-    actual_emissions_annual = sum(
-        M.V_FlowOutAnnual[reg, p, S_i, S_t, S_v, S_o]
-        * M.EmissionActivity[reg, e, S_i, S_t, S_v, S_o]
-        for reg in regions
-        for tmp_r, tmp_e, S_i, S_t, S_v, S_o in M.EmissionActivity.sparse_iterkeys()
-        if tmp_e == e and tmp_r == reg and S_t in M.tech_annual
-        # EmissionsActivity not indexed by p, so make sure (r,p,t,v) combos valid
-        if (reg, p, S_t, S_v) in M.processInputs.keys()
+    # in the case that there is nothing to sum, skip
+    if not flows and not annual_flows:
+        return emission_limit_skip(e, emission_limit)
+
+    actual_emissions = LinearExpression(
+        constant=0, linear_coefs=coefs + annual_coefs, linear_vars=flows + annual_flows
     )
+    expr = actual_emissions <= emission_limit
+    return expr
 
-    expr = actual_emissions + actual_emissions_annual <= emission_limit
 
-    # in the case that there is nothing to sum, skip
-    if isinstance(expr, bool):  # an empty list was generated
-        msg = (
-            "Warning: No technology produces emission '%s', though limit was " 'specified as %s.\n'
-        )
-        logger.warning(msg, (e, emission_limit))
-        SE.write(msg % (e, emission_limit))
-        return Constraint.Skip
-    return expr
+def growth_periods(M: 'TemoaModel', t):
+    """
+    The periods in which tech t has available capacity (in any region), each mapped to the
+    previous one (None for the first).  All the techs are grouped on the first call and held
+    in M._growth_periods.
+    """
+    if not M._growth_periods:
+        tech_periods = defaultdict(set)
+        for _, p, S_t in M.V_CapacityAvailableByPeriodAndTech:
+            tech_periods[S_t].add(p)
+        for S_t, S_periods in tech_periods.items():
+            ordered = sorted(S_periods)
+            M._growth_periods[S_t] = dict(zip(ordered, [None] + ordered[:-1], strict=True))
+    return M._growth_periods.get(t, {})
 
 
 def GrowthRateConstraint_rule(M: 'TemoaModel', p, r, t):
@@ -1917,21 +1849,16 @@ def GrowthRateConstraint_rule(M: 'TemoaModel', p, r, t):
     GRM = value(M.GrowthRateMax[r, t])
     CapPT = M.V_CapacityAvailableByPeriodAndTech
 
-    periods = sorted(set(p_ for r_, p_, t_ in CapPT if t_ == t))
+    periods = growth_periods(M, t)
 
     if p not in periods:
         return Constraint.Skip
 
-    if p == periods[0]:
-        expr = CapPT[r, p, t] <= GRS * GRM
-
+    p_prev = periods[p]
+    if p_prev is not None and (r, p_prev, t) in CapPT.keys():
+        expr = CapPT[r, p, t] <= GRM * CapPT[r, p_prev, t]
     else:
-        p_prev = periods.index(p)
-        p_prev = periods[p_prev - 1]
-        if (r, p_prev, t) in CapPT.keys():
-            expr = CapPT[r, p, t] <= GRM * CapPT[r, p_prev, t]
-        else:
-            expr = CapPT[r, p, t] <= GRS * GRM
+        expr = CapPT[r, p, t] <= GRS * GRM
 
     return expr
 
@@ -1962,32 +1889,14 @@ def MaxActivity_Constraint(M: 'TemoaModel', r, p, t):
     # if r == 'global', the constraint is system-wide
     reg = gather_group_regions(M=M, region=r)
 
-    if t not in M.tech_annual:
-        activity_rpt = sum(
-            M.V_FlowOut[r, p, s, d, S_i, t, S_v, S_o]
-            for r in reg
-            for S_v in M.processVintages.get((r, p, t), [])
-            for S_i in M.processInputs[r, p, t, S_v]
-            for S_o in M.ProcessOutputsByInput[r, p, t, S_v, S_i]
-            for s in M.time_season
-            for d in M.time_of_day
-            if (r, p, s, d, S_i, t, S_v, S_o) in M.V_FlowOut
-        )
-    else:
-        activity_rpt = sum(
-            M.V_FlowOutAnnual[r, p, S_i, t, S_v, S_o]
-            for r in reg
-            for S_v in M.processVintages.get((r, p, t), [])
-            for S_i in M.processInputs[r, p, t, S_v]
-            for S_o in M.ProcessOutputsByInput[r, p, t, S_v, S_i]
-            if (r, p, S_i, t, S_v, S_o) in M.V_FlowOutAnnual
-        )
+    flows = gather_activity_flows(M, reg, p, *M._tech_split[t])
+    # in the case that there is nothing to sum, skip
+    if not flows:
+        return Constraint.Skip
+    activity_rpt = LinearExpression(constant=0, linear_coefs=[1] * len(flows), linear_vars=flows)
 
     max_act = value(M.MaxActivity[r, p, t])
     expr = activity_rpt <= max_act
-    # in the case that there is nothing to sum, skip
-    if isinstance(expr, bool):  # an empty list was generated
-        return Constraint.Skip
     return expr
 
 
@@ -2017,31 +1926,9 @@ def MinActivity_Constraint(M: 'TemoaModel', r, p, t):
     # if r == 'global', the constraint is system-wide
     regions = gather_group_regions(M, r)
 
-    if t not in M.tech_annual:
-        activity_rpt = sum(
-            M.V_FlowOut[_r, p, s, d, S_i, t, S_v, S_o]
-            for _r in regions
-            for S_v in M.processVintages.get((_r, p, t), [])
-            for S_i in M.processInputs[_r, p, t, S_v]
-            for S_o in M.ProcessOutputsByInput[_r, p, t, S_v, S_i]
-            for s in M.time_season
-            for d in M.time_of_day
-            if (_r, p, s, d, S_i, t, S_v, S_o) in M.V_FlowOut
-        )
-    else:
-        activity_rpt = sum(
-            M.V_FlowOutAnnual[_r, p, S_i, t, S_v, S_o]
-            for _r in regions
-            for S_v in M.processVintages.get((_r, p, t), [])
-            for S_i in M.processInputs[_r, p, t, S_v]
-            for S_o in M.ProcessOutputsByInput[_r, p, t, S_v, S_i]
-            if (_r, p, S_i, t, S_v, S_o) in M.V_FlowOutAnnual
-        )
-
-    min_act = value(M.MinActivity[r, p, t])
-    expr = activity_rpt >= min_act
+    flows = gather_activity_flows(M, regions, p, *M._tech_split[t])
     # in the case that there is nothing to sum, skip
-    if isinstance(expr, bool):  # an empty list was generated
+    if not flows:
         logger.error(
             'No elements available to support min-activity: (%s, %d, %s).'
             '  Check data/log for available/suppressed techs.  Requirement IGNORED.',
@@ -2050,6 +1937,10 @@ def MinActivity_Constraint(M: 'TemoaModel', r, p, t):
             t,
         )
         return Constraint.Skip
+    activity_rpt = LinearExpression(constant=0, linear_coefs=[1] * len(flows), linear_vars=flows)
+
+    min_act = value(M.MinActivity[r, p, t])
+    expr = activity_rpt >= min_act
     return expr
 
 
@@ -2072,34 +1963,9 @@ def MinActivityGroup_Constraint(M: 'TemoaModel', r, p, g):
 
     regions = gather_group_regions(M, r)
 
-    activity_p = 0
-    activity_p_annual = 0
-    for r_i in regions:
-        activity_p += sum(
-            M.V_FlowOut[r_i, p, s, d, S_i, S_t, S_v, S_o]
-            for S_t in M.tech_group_members[g]
-            if (r_i, p, S_t) in M.processVintages and S_t not in M.tech_annual
-            for S_v in M.processVintages[r_i, p, S_t]
-            for S_i in M.processInputs[r_i, p, S_t, S_v]
-            for S_o in M.ProcessOutputsByInput[r_i, p, S_t, S_v, S_i]
-            for s in M.time_season
-            for d in M.time_of_day
-            if (r_i, p, s, d, S_i, S_t, S_v, S_o) in M.V_FlowOut
-        )
-
-        activity_p_annual += sum(
-            M.V_FlowOutAnnual[r_i, p, S_i, S_t, S_v, S_o]
-            for S_t in M.tech_group_members[g]
-            if (r_i, p, S_t) in M.processVintages and S_t in M.tech_annual
-            for S_v in M.processVintages[r_i, p, S_t]
-            for S_i in M.processInputs[r_i, p, S_t, S_v]
-            for S_o in M.ProcessOutputsByInput[r_i, p, S_t, S_v, S_i]
-            if (r_i, p, S_i, S_t, S_v, S_o) in M.V_FlowOutAnnual
-        )
-    min_act = value(M.MinActivityGroup[r, p, g])
-    expr = activity_p + activity_p_annual >= min_act
+    flows = gather_activity_flows(M, regions, p, *M._group_techs[g])
     # in the case that there is nothing to sum, skip
-    if isinstance(expr, bool):  # an empty list was generated
+    if not flows:
         logger.error(
             'No elements available to support min-activity group: (%s, %d, %s).'
             '  Check data/log for available/suppressed techs.  Requirement IGNORED.',
@@ -2108,6 +1974,10 @@ def MinActivityGroup_Constraint(M: 'TemoaModel', r, p, g):
             g,
         )
         return Constraint.Skip
+    activity_p = LinearExpression(constant=0, linear_coefs=[1] * len(flows), linear_vars=flows)
+
+    min_act = value(M.MinActivityGroup[r, p, g])
+    expr = activity_p >= min_act
     return expr
 
 
@@ -2126,35 +1996,14 @@ def MaxActivityGroup_Constraint(M: 'TemoaModel', r, p, g):
 
     regions = gather_group_regions(M, r)
 
-    activity_p = 0
-    activity_p_annual = 0
-    for r_i in regions:
-        activity_p += sum(
-            M.V_FlowOut[r_i, p, s, d, S_i, S_t, S_v, S_o]
-            for S_t in M.tech_group_members[g]
-            if (r_i, p, S_t) in M.processVintages and S_t not in M.tech_annual
-            for S_v in M.processVintages[r_i, p, S_t]
-            for S_i in M.processInputs[r_i, p, S_t, S_v]
-            for S_o in M.ProcessOutputsByInput[r_i, p, S_t, S_v, S_i]
-            for s in M.time_season
-            for d in M.time_of_day
-            if (r_i, p, s, d, S_i, S_t, S_v, S_o) in M.V_FlowOut
-        )
-        activity_p_annual += sum(
-            M.V_FlowOutAnnual[r_i, p, S_i, S_t, S_v, S_o]
-            for S_t in M.tech_group_members[g]
-            if (r_i, p, S_t) in M.processVintages and S_t in M.tech_annual
-            for S_v in M.processVintages[r_i, p, S_t]
-            for S_i in M.processInputs[r_i, p, S_t, S_v]
-            for S_o in M.ProcessOutputsByInput[r_i, p, S_t, S_v, S_i]
-            if (r_i, p, S_i, S_t, S_v, S_o) in M.V_FlowOutAnnual
-        )
-
-    max_act = value(M.MaxActivityGroup[r, p, g])
-    expr = activity_p + activity_p_annual <= max_act
+    flows = gather_activity_flows(M, regions, p, *M._group_techs[g])
     # in the case that there is nothing to sum, skip
-    if isinstance(expr, bool):  # an empty list was generated
+    if not flows:
         return Constraint.Skip
+    activity_p = LinearExpression(constant=0, linear_coefs=[1] * len(flows), linear_vars=flows)
+
+    max_act = value(M.MaxActivityGroup[r, p, g])
+    expr = activity_p <= max_act
     return expr
 
 
@@ -2243,17 +2092,17 @@ def MaxCapacityGroup_Constraint(M: 'TemoaModel', r, p, g):
 
     max_capgroup = value(M.MaxCapacityGroup[r, p, g])
 
-    cap = sum(
+    capacities = [
         M.V_CapacityAvailableByPeriodAndTech[r_i, p, t]
-        for t in M.tech_group_members[g]
+        for t in M._group_members[g]
         for r_i in regions
-        if (r_i, p, t) in M.V_CapacityAvailableByPeriodAndTech
-    )
-
-    expr = cap <= max_capgroup
+        if (r_i, p, t) in M.activeCapacityAvailable_rpt
+    ]
     # in the case that there is nothing to sum, skip
-    if isinstance(expr, bool):  # an empty list was generated
+    if not capacities:
         return Constraint.Skip
+    cap = LinearExpression(constant=0, linear_coefs=[1] * len(capacities), linear_vars=capacities)
+    expr = cap <= max_capgroup
     return expr
 
 
@@ -2288,16 +2137,48 @@ def MinCapacity_Constraint(M: 'TemoaModel', r, p, t):
     return expr
 
 
-def gather_group_regions(M: 'TemoaModel', region: str) -> Iterable[str]:
-    if region == 'global':
-        regions = M.regions
-    elif '+' in region:
-        regions = region.split('+')
-    else:
-        regions = (region,)
+def gather_group_regions(M: 'TemoaModel', region: str) -> tuple[str, ...]:
+    # the same group regions are requested for every index of the group constraints
+    regions = M._region_groups.get(region)
+    if regions is None:
+        if region == 'global':
+            regions = tuple(M.regions)
+        elif '+' in region:
+            regions = tuple(region.split('+'))
+        else:
+            regions = (region,)
+        M._region_groups[region] = regions
     return regions
 
 
+def gather_activity_flows(M: 'TemoaModel', regions, p, techs, annual_techs, o=None) -> list:
+    """
+    The output flows of the given techs in period p across the given regions, as used by the
+    activity limit constraints.  The techs come split on tech_annual (see M._tech_split and
+    M._group_techs) and the annual techs contribute their annual flows.  If o is given, only
+    the flows of that output commodity are gathered.
+    :return: list of the flow variables
+    """
+    # The flow variables are indexed by every active process and input/output pair (and, for
+    # the non-annual techs, every time slice), see activeFlow_rpsditvo and activeFlow_rpitvo
+    # in CreateSparseDicts.  So the flows exist for all of the combinations below and are not
+    # tested against the variable index.
+    time_slices = M._time_slices
+    flows = []
+    for r_i in regions:
+        for S_t in techs:
+            for S_v, S_i, S_o in M.processFlows.get((r_i, p, S_t), ()):
+                if o is None or S_o == o:
+                    flows.extend(
+                        M.V_FlowOut[r_i, p, s, d, S_i, S_t, S_v, S_o] for s, d in time_slices
+                    )
+        for S_t in annual_techs:
+            for S_v, S_i, S_o in M.processFlows.get((r_i, p, S_t), ()):
+                if o is None or S_o == o:
+                    flows.append(M.V_FlowOutAnnual[r_i, p, S_i, S_t, S_v, S_o])
+    return flows
+
+
 def MinCapacityGroup_Constraint(M: 'TemoaModel', r, p, g):
     r"""
     Similar to the :code:`MinCapacity` constraint, but works on a group of technologies.
@@ -2306,16 +2187,14 @@ def MinCapacityGroup_Constraint(M: 'TemoaModel', r, p, g):
 
     min_capgroup = value(M.MinCapacityGroup[r, p, g])
 
-    cap = sum(
+    capacities = [
         M.V_CapacityAvailableByPeriodAndTech[r_i, p, t]
-        for t in M.tech_group_members[g]
+        for t in M._group_members[g]
         for r_i in regions
-        if (r_i, p, t) in M.V_CapacityAvailableByPeriodAndTech
-    )
-
-    expr = cap >= min_capgroup
+        if (r_i, p, t) in M.activeCapacityAvailable_rpt
+    ]
     # in the case that there is nothing to sum, skip
-    if isinstance(expr, bool):  # an empty list was generated
+    if not capacities:
         logger.error(
             'No elements available to support min-capacity group: (%s, %d, %s).'
             '  Check data/log for available/suppressed techs.  Requirement IGNORED.',
@@ -2324,6 +2203,8 @@ def MinCapacityGroup_Constraint(M: 'TemoaModel', r, p, g):
             g,
         )
         return Constraint.Skip
+    cap = LinearExpression(constant=0, linear_coefs=[1] * len(capacities), linear_vars=capacities)
+    expr = cap >= min_capgroup
     return expr
 
 
@@ -2331,13 +2212,12 @@ def MinNewCapacityGroup_Constraint(M: 'TemoaModel', r, p, g):
     r"""
     Similar to the :code:`MinNewCapacity` constraint, but works on a group of technologies."""
     min_new_cap = value(M.MinNewCapacityGroup[r, p, g])
-    agg_new_cap = sum(
+    new_capacities = [
         M.V_NewCapacity[r, t, p]
-        for t in M.tech_group_members[g]
-        if (r, p, t) in M.V_CapacityAvailableByPeriodAndTech
-    )
-    expr = agg_new_cap >= min_new_cap
-    if isinstance(expr, bool):
+        for t in M._group_members[g]
+        if (r, p, t) in M.activeCapacityAvailable_rpt
+    ]
+    if not new_capacities:
         logger.error(
             'No elements available to support min-activity group: (%s, %d, %s).'
             '  Check data/log for available/suppressed techs.  Requirement IGNORED.',
@@ -2346,6 +2226,10 @@ def MinNewCapacityGroup_Constraint(M: 'TemoaModel', r, p, g):
             g,
         )
         return Constraint.Skip
+    agg_new_cap = LinearExpression(
+        constant=0, linear_coefs=[1] * len(new_capacities), linear_vars=new_capacities
+    )
+    expr = agg_new_cap >= min_new_cap
     return expr
 
 
@@ -2353,17 +2237,69 @@ def MaxNewCapacityGroup_Constraint(M: 'TemoaModel', r, p, g):
     r"""
     Similar to the :code:`MinNewCapacity` constraint, but works on a group of technologies."""
     max_new_cap = value(M.MaxNewCapacityGroup[r, p, g])
-    agg_new_cap = sum(
+    new_capacities = [
         M.V_NewCapacity[r, t, p]
-        for t in M.tech_group_members[g]
-        if (r, p, t) in M.V_CapacityAvailableByPeriodAndTech
+        for t in M._group_members[g]
+        if (r, p, t) in M.activeCapacityAvailable_rpt
+    ]
+    if not new_capacities:
+        return Constraint.Skip
+    agg_new_cap = LinearExpression(
+        constant=0, linear_coefs=[1] * len(new_capacities), linear_vars=new_capacities
     )
     expr = max_new_cap >= agg_new_cap
-    if isinstance(expr, bool):
-        return Constraint.Skip
     return expr
 
 
+def group_activity_flows(M: 'TemoaModel', regions, p, g) -> list:
+    """
+    The output flows of the tech group g in period p across the given regions.  Every member
+    t of the group has its own share constraint on the same group activity, so the flows are
+    gathered once per (regions, p, g) and held in M._group_activity.
+    """
+    key = (regions, p, g)
+    flows = M._group_activity.get(key)
+    if flows is None:
+        flows = gather_activity_flows(M, regions, p, *M._group_techs[g])
+        M._group_activity[key] = flows
+    return flows
+
+
+def group_capacity_techs(M: 'TemoaModel', r, p, g, new=False) -> tuple:
+    """
+    The members of tech group g with available capacity in (r, p), or when new is set, with
+    new capacity built in p.  These are the same for every member's capacity share, so they
+    are filtered once per (r, p, g) and held in M._group_capacity_techs.
+    """
+    key = (r, p, g, new)
+    techs = M._group_capacity_techs.get(key)
+    if techs is None:
+        if new:
+            techs = tuple(S_t for S_t in M._group_members[g] if (r, S_t, p) in M.activeCapacity_rtv)
+        else:
+            techs = tuple(S_t for S_t in M._group_members[g] if (r, p, S_t) in M.processVintages)
+        M._group_capacity_techs[key] = techs
+    return techs
+
+
+def activity_share_difference(M: 'TemoaModel', regions, p, t, g, share):
+    """
+    The activity of tech t less the given share of the activity of its tech group g, summed
+    over the regions in period p.  Both activity share constraints compare this to zero.
+    :return: the difference as a single linear expression, or None if there is nothing to sum
+    """
+    tech_flows = gather_activity_flows(M, regions, p, *M._tech_split[t])
+    group_flows = group_activity_flows(M, regions, p, g)
+    if not tech_flows and not group_flows:
+        return None
+    # the tech's own flows appear in both halves, the writer combines their coefficients
+    return LinearExpression(
+        constant=0,
+        linear_coefs=[1] * len(tech_flows) + [-share] * len(group_flows),
+        linear_vars=tech_flows + group_flows,
+    )
+
+
 def MinActivityShare_Constraint(M: 'TemoaModel', r, p, t, g):
     r"""
     The MinActivityShare constraint sets a minimum capacity share for a given
@@ -2372,49 +2308,11 @@ def MinActivityShare_Constraint(M: 'TemoaModel', r, p, t, g):
     members are different types for LDVs. This constraint could be used to enforce
     that no less than 10% of LDVs must be of a certain type."""
 
-    if t not in M.tech_annual:
-        activity_rpt = sum(
-            M.V_FlowOut[r, p, s, d, S_i, t, S_v, S_o]
-            for S_v in M.processVintages.get((r, p, t), [])
-            for S_i in M.processInputs[r, p, t, S_v]
-            for S_o in M.ProcessOutputsByInput[r, p, t, S_v, S_i]
-            for s in M.time_season
-            for d in M.time_of_day
-        )
-    else:
-        activity_rpt = sum(
-            M.V_FlowOutAnnual[r, p, S_i, t, S_v, S_o]
-            for S_v in M.processVintages.get((r, p, t), [])
-            for S_i in M.processInputs[r, p, t, S_v]
-            for S_o in M.ProcessOutputsByInput[r, p, t, S_v, S_i]
-        )
-
-    activity_t = activity_rpt
-    activity_p = sum(
-        M.V_FlowOut[r, p, s, d, S_i, S_t, S_v, S_o]
-        for S_t in M.tech_group_members[g]
-        if (r, p, S_t) in M.processVintages and S_t not in M.tech_annual
-        for S_v in M.processVintages[r, p, S_t]
-        for S_i in M.processInputs[r, p, S_t, S_v]
-        for S_o in M.ProcessOutputsByInput[r, p, S_t, S_v, S_i]
-        for s in M.time_season
-        for d in M.time_of_day
-    )
-
-    activity_p_annual = sum(
-        M.V_FlowOutAnnual[r, p, S_i, S_t, S_v, S_o]
-        for S_t in M.tech_group_members[g]
-        if (r, p, S_t) in M.processVintages and S_t in M.tech_annual
-        for S_v in M.processVintages[r, p, S_t]
-        for S_i in M.processInputs[r, p, S_t, S_v]
-        for S_o in M.ProcessOutputsByInput[r, p, S_t, S_v, S_i]
-    )
-    activity_group = activity_p + activity_p_annual
     min_activity_share = value(M.MinActivityShare[r, p, t, g])
+    share_difference = activity_share_difference(M, (r,), p, t, g, min_activity_share)
 
-    expr = activity_t >= min_activity_share * activity_group
     # in the case that there is nothing to sum, skip
-    if isinstance(expr, bool):  # an empty list was generated
+    if share_difference is None:
         logger.error(
             'No elements available to support min-activity share group: (%s, %d, %s).'
             '  Check data/log for available/suppressed techs.  Requirement IGNORED.',
@@ -2423,6 +2321,7 @@ def MinActivityShare_Constraint(M: 'TemoaModel', r, p, t, g):
             g,
         )
         return Constraint.Skip
+    expr = share_difference >= 0
     return expr
 
 
@@ -2436,58 +2335,13 @@ def MaxActivityShare_Constraint(M: 'TemoaModel', r, p, t, g):
 
     regions = gather_group_regions(M, r)
 
-    if t not in M.tech_annual:
-        activity_rpt = sum(
-            M.V_FlowOut[_r, p, s, d, S_i, t, S_v, S_o]
-            for _r in regions
-            for S_v in M.processVintages.get((_r, p, t), [])
-            for S_i in M.processInputs[_r, p, t, S_v]
-            for S_o in M.ProcessOutputsByInput[_r, p, t, S_v, S_i]
-            for s in M.time_season
-            for d in M.time_of_day
-            if (_r, p, s, d, S_i, t, S_v, S_o) in M.V_FlowOut
-        )
-    else:
-        activity_rpt = sum(
-            M.V_FlowOutAnnual[_r, p, S_i, t, S_v, S_o]
-            for _r in regions
-            for S_v in M.processVintages.get((_r, p, t), [])
-            for S_i in M.processInputs[_r, p, t, S_v]
-            for S_o in M.ProcessOutputsByInput[_r, p, t, S_v, S_i]
-            if (_r, p, S_i, t, S_v, S_o) in M.V_FlowOutAnnual
-        )
-
-    activity_t = activity_rpt
-    activity_p = sum(
-        M.V_FlowOut[_r, p, s, d, S_i, S_t, S_v, S_o]
-        for S_t in M.tech_group_members[g]
-        for _r in regions
-        if (_r, p, S_t) in M.processVintages and S_t not in M.tech_annual
-        for S_v in M.processVintages[_r, p, S_t]
-        for S_i in M.processInputs[_r, p, S_t, S_v]
-        for S_o in M.ProcessOutputsByInput[_r, p, S_t, S_v, S_i]
-        for s in M.time_season
-        for d in M.time_of_day
-        if (_r, p, s, d, S_i, S_t, S_v, S_o) in M.V_FlowOut
-    )
-
-    activity_p_annual = sum(
-        M.V_FlowOutAnnual[_r, p, S_i, S_t, S_v, S_o]
-        for S_t in M.tech_group_members[g]
-        for _r in regions
-        if (_r, p, S_t) in M.processVintages and S_t in M.tech_annual
-        for S_v in M.processVintages[_r, p, S_t]
-        for S_i in M.processInputs[_r, p, S_t, S_v]
-        for S_o in M.ProcessOutputsByInput[_r, p, S_t, S_v, S_i]
-        if (_r, p, S_i, S_t, S_v, S_o) in M.V_FlowOutAnnual
-    )
-    activity_group = activity_p + activity_p_annual
     max_activity_share = value(M.MaxActivityShare[r, p, t, g])
+    share_difference = activity_share_difference(M, regions, p, t, g, max_activity_share)
 
-    expr = activity_t <= max_activity_share * activity_group
     # in the case that there is nothing to sum, skip
-    if isinstance(expr, bool):  # an empty list was generated
+    if share_difference is None:
         return Constraint.Skip
+    expr = share_difference <= 0
     logger.debug(
         'created max activity constraint for (%s, %d, %s, %s) of %0.2f',
         (r, p, t, g, max_activity_share),
@@ -2495,6 +2349,18 @@ def MaxActivityShare_Constraint(M: 'TemoaModel', r, p, t, g):
     return expr
 
 
+def capacity_share_difference(capacity, group_capacities, share):
+    """
+    The capacity of a tech less the given share of its group's capacity, as the single linear
+    expression all four capacity share constraints compare to zero.
+    """
+    return LinearExpression(
+        constant=0,
+        linear_coefs=[1] + [-share] * len(group_capacities),
+        linear_vars=[capacity] + group_capacities,
+    )
+
+
 def MinCapacityShare_Constraint(M: 'TemoaModel', r, p, t, g):
     r"""
     The MinCapacityShare constraint sets a minimum capacity share for a given
@@ -2503,25 +2369,17 @@ def MinCapacityShare_Constraint(M: 'TemoaModel', r, p, t, g):
     members are different types for LDVs. This constraint could be used to enforce
     that no less than 10% of LDVs must be of a certain type."""
 
-    capacity_t = M.V_CapacityAvailableByPeriodAndTech[r, p, t]
-    capacity_group = sum(
-        M.V_CapacityAvailableByPeriodAndTech[r, p, S_t]
-        for S_t in M.tech_group_members[g]
-        if (r, p, S_t) in M.processVintages.keys()
-    )
     min_cap_share = value(M.MinCapacityShare[r, p, t, g])
+    share_difference = capacity_share_difference(
+        M.V_CapacityAvailableByPeriodAndTech[r, p, t],
+        [
+            M.V_CapacityAvailableByPeriodAndTech[r, p, S_t]
+            for S_t in group_capacity_techs(M, r, p, g)
+        ],
+        min_cap_share,
+    )
 
-    expr = capacity_t >= min_cap_share * capacity_group
-    if isinstance(expr, bool):
-        logger.error(
-            'No elements available to support min-capacity share: (%s, %d, %s).'
-            '  Check data/log for available/suppressed techs.  Requirement IGNORED.',
-            r,
-            p,
-            g,
-        )
-        return Constraint.Skip
-    return expr
+    return share_difference >= 0
 
 
 def MaxCapacityShare_Constraint(M: 'TemoaModel', r, p, t, g):
@@ -2532,18 +2390,17 @@ def MaxCapacityShare_Constraint(M: 'TemoaModel', r, p, t, g):
     members are different types for LDVs. This constraint could be used to enforce
     that no more than 10% of LDVs must be of a certain type."""
 
-    capacity_t = M.V_CapacityAvailableByPeriodAndTech[r, p, t]
-    capacity_group = sum(
-        M.V_CapacityAvailableByPeriodAndTech[r, p, S_t]
-        for S_t in M.tech_group_members[g]
-        if (r, p, S_t) in M.processVintages.keys()
-    )
     max_cap_share = value(M.MaxCapacityShare[r, p, t, g])
+    share_difference = capacity_share_difference(
+        M.V_CapacityAvailableByPeriodAndTech[r, p, t],
+        [
+            M.V_CapacityAvailableByPeriodAndTech[r, p, S_t]
+            for S_t in group_capacity_techs(M, r, p, g)
+        ],
+        max_cap_share,
+    )
 
-    expr = capacity_t <= max_cap_share * capacity_group
-    if isinstance(expr, bool):
-        return Constraint.Skip
-    return expr
+    return share_difference <= 0
 
 
 def MinNewCapacityShare_Constraint(M: 'TemoaModel', r, p, t, g):
@@ -2554,25 +2411,14 @@ def MinNewCapacityShare_Constraint(M: 'TemoaModel', r, p, t, g):
     members are different types for LDVs. This constraint could be used to enforce
     that no less than 10% of new LDV purchases in a given year must be of a certain type."""
 
-    capacity_t = M.V_NewCapacity[r, t, p]
-    capacity_group = sum(
-        M.V_NewCapacity[r, S_t, p]
-        for S_t in M.tech_group_members[g]
-        if (r, S_t, p) in M.V_NewCapacity.keys()
-    )
     min_cap_share = value(M.MinNewCapacityShare[r, p, t, g])
+    share_difference = capacity_share_difference(
+        M.V_NewCapacity[r, t, p],
+        [M.V_NewCapacity[r, S_t, p] for S_t in group_capacity_techs(M, r, p, g, new=True)],
+        min_cap_share,
+    )
 
-    expr = capacity_t >= min_cap_share * capacity_group
-    if isinstance(expr, bool):
-        logger.error(
-            'No elements available to support min-new capacity share: (%s, %d, %s).'
-            '  Check data/log for available/suppressed techs.  Requirement IGNORED.',
-            r,
-            p,
-            g,
-        )
-        return Constraint.Skip
-    return expr
+    return share_difference >= 0
 
 
 def MaxNewCapacityShare_Constraint(M: 'TemoaModel', r, p, t, g):
@@ -2583,18 +2429,14 @@ def MaxNewCapacityShare_Constraint(M: 'TemoaModel', r, p, t, g):
     members are different types for LDVs. This constraint could be used to enforce
     that no more than 10% of LDV purchases in a given year must be of a certain type."""
 
-    capacity_t = M.V_NewCapacity[r, t, p]
-    capacity_group = sum(
-        M.V_NewCapacity[r, S_t, p]
-        for S_t in M.tech_group_members[g]
-        if (r, S_t, p) in M.V_NewCapacity.keys()
-    )
     max_cap_share = value(M.MaxNewCapacityShare[r, p, t, g])
+    share_difference = capacity_share_difference(
+        M.V_NewCapacity[r, t, p],
+        [M.V_NewCapacity[r, S_t, p] for S_t in group_capacity_techs(M, r, p, g, new=True)],
+        max_cap_share,
+    )
 
-    expr = capacity_t <= max_cap_share * capacity_group
-    if isinstance(expr, bool):
-        return Constraint.Skip
-    return expr
+    return share_difference <= 0
 
 
 def MinAnnualCapacityFactor_Constraint(M: 'TemoaModel', r, p, t, o):
@@ -2615,35 +2457,12 @@ def MinAnnualCapacityFactor_Constraint(M: 'TemoaModel', r, p, t, o):
     regions = gather_group_regions(M, r)
     # we need to screen here because it is possible that the restriction extends beyond the
     # lifetime of any vintage of the tech...
-    if (r, p, t) not in M.V_CapacityAvailableByPeriodAndTech:
+    if (r, p, t) not in M.activeCapacityAvailable_rpt:
         return Constraint.Skip
 
-    if t not in M.tech_annual:
-        activity_rpt = sum(
-            M.V_FlowOut[_r, p, s, d, S_i, t, S_v, o]
-            for _r in regions
-            for S_v in M.processVintages.get((_r, p, t), [])
-            for S_i in M.processInputs[_r, p, t, S_v]
-            for s in M.time_season
-            for d in M.time_of_day
-            if (_r, p, s, d, S_i, t, S_v, o) in M.V_FlowOut
-        )
-    else:
-        activity_rpt = sum(
-            M.V_FlowOutAnnual[_r, p, S_i, t, S_v, o]
-            for _r in regions
-            for S_v in M.processVintages.get((_r, p, t), [])
-            for S_i in M.processInputs[_r, p, t, S_v]
-            if (_r, p, S_i, t, S_v, o) in M.V_FlowOutAnnual
-        )
-
-    max_possible_activity_rpt = (
-        M.V_CapacityAvailableByPeriodAndTech[r, p, t] * M.CapacityToActivity[r, t]
-    )
-    min_annual_cf = value(M.MinAnnualCapacityFactor[r, p, t, o])
-    expr = activity_rpt >= min_annual_cf * max_possible_activity_rpt
-    # in the case that there is nothing to sum, skip
-    if isinstance(expr, bool):  # an empty list was generated
+    flows = gather_activity_flows(M, regions, p, *M._tech_split[t], o)
+    # in the case that there is nothing to sum, skip before building anything
+    if not flows:
         logger.error(
             'No elements available to support min-annual capacity factor: (%s, %d, %s).'
             '  Check data/log for available/suppressed techs.  Requirement IGNORED.',
@@ -2652,7 +2471,13 @@ def MinAnnualCapacityFactor_Constraint(M: 'TemoaModel', r, p, t, o):
             t,
         )
         return Constraint.Skip
-    return expr
+    activity_rpt = LinearExpression(constant=0, linear_coefs=[1] * len(flows), linear_vars=flows)
+
+    max_possible_activity_rpt = (
+        M.V_CapacityAvailableByPeriodAndTech[r, p, t] * M.CapacityToActivity[r, t]
+    )
+    min_annual_cf = value(M.MinAnnualCapacityFactor[r, p, t, o])
+    return activity_rpt >= min_annual_cf * max_possible_activity_rpt
 
 
 def MaxAnnualCapacityFactor_Constraint(M: 'TemoaModel', r, p, t, o):
@@ -2673,37 +2498,20 @@ def MaxAnnualCapacityFactor_Constraint(M: 'TemoaModel', r, p, t, o):
     regions = gather_group_regions(M, r)
     # we need to screen here because it is possible that the restriction extends beyond the
     # lifetime of any vintage of the tech...
-    if (r, p, t) not in M.V_CapacityAvailableByPeriodAndTech:
+    if (r, p, t) not in M.activeCapacityAvailable_rpt:
         return Constraint.Skip
 
-    if t not in M.tech_annual:
-        activity_rpt = sum(
-            M.V_FlowOut[_r, p, s, d, S_i, t, S_v, o]
-            for _r in regions
-            for S_v in M.processVintages.get((_r, p, t), [])
-            for S_i in M.processInputs[_r, p, t, S_v]
-            for s in M.time_season
-            for d in M.time_of_day
-            if (_r, p, s, d, S_i, t, S_v, o) in M.V_FlowOut
-        )
-    else:
-        activity_rpt = sum(
-            M.V_FlowOutAnnual[_r, p, S_i, t, S_v, o]
-            for _r in regions
-            for S_v in M.processVintages.get((_r, p, t), [])
-            for S_i in M.processInputs[_r, p, t, S_v]
-            if (_r, p, S_i, t, S_v, o) in M.V_FlowOutAnnual
-        )
+    flows = gather_activity_flows(M, regions, p, *M._tech_split[t], o)
+    # in the case that there is nothing to sum, skip before building anything
+    if not flows:
+        return Constraint.Skip
+    activity_rpt = LinearExpression(constant=0, linear_coefs=[1] * len(flows), linear_vars=flows)
 
     max_possible_activity_rpt = (
         M.V_CapacityAvailableByPeriodAndTech[r, p, t] * M.CapacityToActivity[r, t]
     )
     max_annual_cf = value(M.MaxAnnualCapacityFactor[r, p, t, o])
-    expr = activity_rpt <= max_annual_cf * max_possible_activity_rpt
-    # in the case that there is nothing to sum, skip
-    if isinstance(expr, bool):  # an empty list was generated
-        return Constraint.Skip
-    return expr
+    return activity_rpt <= max_annual_cf * max_possible_activity_rpt
 
 
 def TechInputSplit_Constraint(M: 'TemoaModel', r, p, s, d, i, t, v):
@@ -2713,18 +2521,18 @@ def TechInputSplit_Constraint(M: 'TemoaModel', r, p, s, d, i, t, v):
     TechOutputSplit_Constraint for an analogous explanation. Under this constraint,
     only the technologies with variable output at the timeslice level (i.e.,
     NOT in the :code:`tech_annual` set) are considered."""
-    inp = sum(
-        M.V_FlowOut[r, p, s, d, i, t, v, S_o] / value(M.Efficiency[r, i, t, v, S_o])
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, i]
-    )
-
-    total_inp = sum(
-        M.V_FlowOut[r, p, s, d, S_i, t, v, S_o] / value(M.Efficiency[r, S_i, t, v, S_o])
-        for S_i in M.processInputs[r, p, t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, i]
-    )
-
-    expr = inp >= M.TechInputSplit[r, p, i, t] * total_inp
+    # the input of i less the split share of the total input, with the inverse efficiencies
+    # (and the share) folded into the coefficients of a single linear expression
+    outputs = M.ProcessOutputsByInput[r, p, t, v, i]
+    split = M.TechInputSplit[r, p, i, t]
+    coefs = [M._eff_inv[r, i, t, v, S_o] for S_o in outputs]
+    flows = [M.V_FlowOut[r, p, s, d, i, t, v, S_o] for S_o in outputs]
+    for S_i in M.processInputs[r, p, t, v]:
+        for S_o in outputs:
+            coefs.append(-split * M._eff_inv[r, S_i, t, v, S_o])
+            flows.append(M.V_FlowOut[r, p, s, d, S_i, t, v, S_o])
+
+    expr = LinearExpression(constant=0, linear_coefs=coefs, linear_vars=flows) >= 0
     return expr
 
 
@@ -2735,18 +2543,16 @@ def TechInputSplitAnnual_Constraint(M: 'TemoaModel', r, p, i, t, v):
     TechOutputSplitAnnual_Constraint for an analogous explanation. Under this
     function, only the technologies with constant annual output (i.e., members
     of the :math:`tech_annual` set) are considered."""
-    inp = sum(
-        M.V_FlowOutAnnual[r, p, i, t, v, S_o] / value(M.Efficiency[r, i, t, v, S_o])
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, i]
-    )
-
-    total_inp = sum(
-        M.V_FlowOutAnnual[r, p, S_i, t, v, S_o] / value(M.Efficiency[r, S_i, t, v, S_o])
-        for S_i in M.processInputs[r, p, t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, i]
-    )
-
-    expr = inp >= M.TechInputSplit[r, p, i, t] * total_inp
+    outputs = M.ProcessOutputsByInput[r, p, t, v, i]
+    split = M.TechInputSplit[r, p, i, t]
+    coefs = [M._eff_inv[r, i, t, v, S_o] for S_o in outputs]
+    flows = [M.V_FlowOutAnnual[r, p, i, t, v, S_o] for S_o in outputs]
+    for S_i in M.processInputs[r, p, t, v]:
+        for S_o in outputs:
+            coefs.append(-split * M._eff_inv[r, S_i, t, v, S_o])
+            flows.append(M.V_FlowOutAnnual[r, p, S_i, t, v, S_o])
+
+    expr = LinearExpression(constant=0, linear_coefs=coefs, linear_vars=flows) >= 0
     return expr
 
 
@@ -2759,23 +2565,45 @@ def TechInputSplitAverage_Constraint(M: 'TemoaModel', r, p, i, t, v):
     so even though it applies to technologies with variable output at the timeslice level,
     the constraint only fixes the input shares over the course of a year."""
 
-    inp = sum(
-        M.V_FlowOut[r, p, s, d, i, t, v, S_o] / value(M.Efficiency[r, i, t, v, S_o])
-        for s in M.time_season
-        for d in M.time_of_day
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, i]
-    )
+    # each (input, output) coefficient is the same in every time slice, so it is repeated
+    time_slices = M._time_slices
+    n_slices = len(time_slices)
+    outputs = M.ProcessOutputsByInput[r, p, t, v, i]
+    split = M.TechInputSplitAverage[r, p, i, t]
+    coefs = []
+    flows = []
+    for S_o in outputs:
+        coefs.extend([M._eff_inv[r, i, t, v, S_o]] * n_slices)
+        flows.extend(M.V_FlowOut[r, p, s, d, i, t, v, S_o] for s, d in time_slices)
+    for S_i in M.processInputs[r, p, t, v]:
+        for S_o in outputs:
+            coefs.extend([-split * M._eff_inv[r, S_i, t, v, S_o]] * n_slices)
+            flows.extend(M.V_FlowOut[r, p, s, d, S_i, t, v, S_o] for s, d in time_slices)
+
+    expr = LinearExpression(constant=0, linear_coefs=coefs, linear_vars=flows) >= 0
+    return expr
 
-    total_inp = sum(
-        M.V_FlowOut[r, p, s, d, S_i, t, v, S_o] / value(M.Efficiency[r, S_i, t, v, S_o])
-        for s in M.time_season
-        for d in M.time_of_day
-        for S_i in M.processInputs[r, p, t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, i]
-    )
 
-    expr = inp >= M.TechInputSplitAverage[r, p, i, t] * total_inp
-    return expr
+def split_total_flows(M: 'TemoaModel', r, p, s, d, t, v) -> list:
+    """
+    All the output flows of process (r, t, v) in time slice (s, d) of period p, or its annual
+    flows when s and d are None.  Each output o of the process has its own output split
+    constraint on the same total, so the flows are gathered once and held in
+    M._split_total_flows until the split constraints are built.
+    """
+    key = (r, p, s, d, t, v)
+    flows = M._split_total_flows.get(key)
+    if flows is None:
+        if s is None:
+            flows = [
+                M.V_FlowOutAnnual[r, p, S_i, t, v, S_o] for S_i, S_o in M.processIOPairs[r, p, t, v]
+            ]
+        else:
+            flows = [
+                M.V_FlowOut[r, p, s, d, S_i, t, v, S_o] for S_i, S_o in M.processIOPairs[r, p, t, v]
+            ]
+        M._split_total_flows[key] = flows
+    return flows
 
 
 def TechOutputSplit_Constraint(M: 'TemoaModel', r, p, s, d, t, v, o):
@@ -2813,17 +2641,18 @@ def TechOutputSplit_Constraint(M: 'TemoaModel', r, p, s, d, t, v, o):
          TOS_{r, p, t, o} \cdot \sum_{I, O, t \not \in T^{a}} \textbf{FO}_{r, p, s, d, i, t, v, o}
 
        \forall \{r, p, s, d, t, v, o\} \in \Theta_{\text{TechOutputSplit}}"""
-    out = sum(
-        M.V_FlowOut[r, p, s, d, S_i, t, v, o] for S_i in M.ProcessInputsByOutput[r, p, t, v, o]
-    )
+    out = [M.V_FlowOut[r, p, s, d, S_i, t, v, o] for S_i in M.ProcessInputsByOutput[r, p, t, v, o]]
+    total_out = split_total_flows(M, r, p, s, d, t, v)
+    split = M.TechOutputSplit[r, p, t, o]
 
-    total_out = sum(
-        M.V_FlowOut[r, p, s, d, S_i, t, v, S_o]
-        for S_i in M.processInputs[r, p, t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
+    expr = (
+        LinearExpression(
+            constant=0,
+            linear_coefs=[1] * len(out) + [-split] * len(total_out),
+            linear_vars=out + total_out,
+        )
+        >= 0
     )
-
-    expr = out >= M.TechOutputSplit[r, p, t, o] * total_out
     return expr
 
 
@@ -2843,17 +2672,18 @@ def TechOutputSplitAnnual_Constraint(M: 'TemoaModel', r, p, t, v, o):
          TOS_{r, p, t, o} \cdot \sum_{I, O, T^{a}} \textbf{FOA}_{r, p, s, d, i, t \in T^{a}, v, o}
 
        \forall \{r, p, t \in T^{a}, v, o\} \in \Theta_{\text{TechOutputSplitAnnual}}"""
-    out = sum(
-        M.V_FlowOutAnnual[r, p, S_i, t, v, o] for S_i in M.ProcessInputsByOutput[r, p, t, v, o]
-    )
+    out = [M.V_FlowOutAnnual[r, p, S_i, t, v, o] for S_i in M.ProcessInputsByOutput[r, p, t, v, o]]
+    total_out = split_total_flows(M, r, p, None, None, t, v)
+    split = M.TechOutputSplit[r, p, t, o]
 
-    total_out = sum(
-        M.V_FlowOutAnnual[r, p, S_i, t, v, S_o]
-        for S_i in M.processInputs[r, p, t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
+    expr = (
+        LinearExpression(
+            constant=0,
+            linear_coefs=[1] * len(out) + [-split] * len(total_out),
+            linear_vars=out + total_out,
+        )
+        >= 0
     )
-
-    expr = out >= M.TechOutputSplit[r, p, t, o] * total_out
     return expr
 
 
@@ -2862,50 +2692,63 @@ def RenewablePortfolioStandard_Constraint(M: 'TemoaModel', r, p, g):
     Allows users to specify the share of electricity generation in a region
     coming from RPS-eligible technologies."""
 
-    inp = sum(
-        M.V_FlowOut[r, p, s, d, S_i, t, v, S_o]
-        for t in M.tech_group_members[g]
-        for (_t, v) in M.processReservePeriods[r, p]
-        if _t == t
-        for s in M.time_season
-        for d in M.time_of_day
-        for S_i in M.processInputs[r, p, t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
-    )
-
-    total_inp = sum(
-        M.V_FlowOut[r, p, s, d, S_i, t, v, S_o]
-        for (t, v) in M.processReservePeriods[r, p]
-        for s in M.time_season
-        for d in M.time_of_day
-        for S_i in M.processInputs[r, p, t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
-    )
-
-    expr = inp >= (value(M.RenewablePortfolioStandard[r, p, g]) * total_inp)
+    # the eligible flows less the standard's share of all the flows, gathered in one pass over
+    # the reserve processes:  each eligible flow is in both sums, so it gets 1 - share
+    share = value(M.RenewablePortfolioStandard[r, p, g])
+    eligible = set(M._group_members[g])
+    time_slices = M._time_slices
+    coefs = []
+    flows = []
+    for t, v in M.processReservePeriods[r, p]:
+        coef = 1 - share if t in eligible else -share
+        for S_i, S_o in M.processIOPairs[r, p, t, v]:
+            coefs.extend([coef] * len(time_slices))
+            flows.extend(M.V_FlowOut[r, p, s, d, S_i, t, v, S_o] for s, d in time_slices)
+
+    expr = LinearExpression(constant=0, linear_coefs=coefs, linear_vars=flows) >= 0
     return expr
 
 
 # ---------------------------------------------------------------
 # Define rule-based parameters
 # ---------------------------------------------------------------
+def process_remaining_life(M: 'TemoaModel', keys):
+    """
+    The years of life left at the start of period p, and the length of p, for each of the
+    (r, p, t, v) keys, as two arrays aligned with the keys.
+    """
+    remaining = np.array(
+        [v + value(M.LifetimeProcess[r, t, v]) - p for r, p, t, v in keys], dtype=float
+    )
+    period_length = np.array([value(M.PeriodLength[p]) for r, p, t, v in keys], dtype=float)
+    return remaining, period_length
+
+
 def ParamModelProcessLife_rule(M: 'TemoaModel', r, p, t, v):
-    life_length = value(M.LifetimeProcess[r, t, v])
-    tpl = min(v + life_length - p, value(M.PeriodLength[p]))
+    # the lives of all the processes are found in one pass on the first call
+    if not M._model_process_life:
+        keys = tuple(M.ModelProcessLife_rptv)
+        remaining, period_length = process_remaining_life(M, keys)
+        tpl = np.minimum(remaining, period_length)
+        M._model_process_life = dict(zip(keys, tpl.tolist(), strict=True))
 
-    return tpl
+    return M._model_process_life[r, p, t, v]
 
 
 def ParamPeriodLength(M: 'TemoaModel', p):
     # This specifically does not use time_optimize because this function is
-    # called /over/ time_optimize.
-    periods = sorted(M.time_future)
-
-    i = periods.index(p)
-
-    # The +1 won't fail, because this rule is called over time_optimize, which
+    # called /over/ time_optimize.  The periods are sorted once, on the first call,
+    # and the length of every period is held in M._period_length.
+    if not M._period_length:
+        periods = sorted(M.time_future)
+        M._period_length = {
+            period: next_period - period
+            for period, next_period in zip(periods[:-1], periods[1:], strict=True)
+        }
+
+    # p is always a key, because this rule is called over time_optimize, which
     # lacks the last period in time_future.
-    length = periods[i + 1] - periods[i]
+    length = M._period_length[p]
 
     return length
 
@@ -2920,17 +2763,16 @@ def ParamProcessLifeFraction_rule(M: 'TemoaModel', r, p, t, v):
     calculate the fraction of the period that the technology is able to
     create useful output.
     """
-    eol_year = v + value(M.LifetimeProcess[r, t, v])
-    frac = eol_year - p
-    period_length = value(M.PeriodLength[p])
-    if frac >= period_length:
-        # try to avoid floating point round-off errors for the common case.
-        return 1
+    # the fractions of all the processes are found in one pass on the first call
+    if not M._process_life_frac:
+        keys = tuple(M.ProcessLifeFrac_rptv)
+        remaining, period_length = process_remaining_life(M, keys)
+        # a process that lasts the whole period gets exactly 1, which avoids floating point
+        # round-off errors for the common case
+        frac = np.where(remaining >= period_length, 1.0, remaining / period_length)
+        M._process_life_frac = dict(zip(keys, frac.tolist(), strict=True))
 
-        # number of years into final period loan is complete
-
-    frac /= float(period_length)
-    return frac
+    return M._process_life_frac[r, p, t, v]
 
 
 def loan_annualization_rate(loan_rate: float | None, loan_life: int | float) -> float:
@@ -2956,7 +2798,16 @@ def ParamLoanAnnualize_rule(M: 'TemoaModel', r, t, v):
 
 
 def SegFracPerSeason_rule(M: 'TemoaModel', s):
-    return sum(M.SegFrac[s, S_d] for S_d in M.time_of_day)
+    # the SegFrac table is summed across the times of day for all the seasons at once, on the
+    # first call, and held in M._segfrac_per_season
+    if not M._segfrac_per_season:
+        seasons = tuple(M.time_season)
+        segfrac = np.array(
+            [[value(M.SegFrac[S_s, S_d]) for S_d in M.time_of_day] for S_s in seasons],
+            dtype=float,
+        )
+        M._segfrac_per_season = dict(zip(seasons, segfrac.sum(axis=1).tolist(), strict=True))
+    return M._segfrac_per_season[s]
 
 
 def LinkedEmissionsTech_Constraint(M: 'TemoaModel', r, p, s, d, t, v, e):
@@ -2984,16 +2835,15 @@ def LinkedEmissionsTech_Constraint(M: 'TemoaModel', r, p, s, d, t, v, e):
     """
     linked_t = M.LinkedTechs[r, t, e]
 
-    primary_flow = sum(
-        M.V_FlowOut[r, p, s, d, S_i, t, v, S_o] * M.EmissionActivity[r, e, S_i, t, v, S_o]
-        for S_i in M.processInputs[r, p, t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, t, v, S_i]
-    )
-
-    linked_flow = sum(
-        M.V_FlowOut[r, p, s, d, S_i, linked_t, v, S_o]
-        for S_i in M.processInputs[r, p, linked_t, v]
-        for S_o in M.ProcessOutputsByInput[r, p, linked_t, v, S_i]
-    )
-
-    return -primary_flow == linked_flow
+    # the emissions of the primary tech and the flows of the linked tech sum to zero, so
+    # both sides go into one expression with the emission activities as coefficients
+    flows = []
+    coefs = []
+    for S_i, S_o in M.processIOPairs[r, p, t, v]:
+        flows.append(M.V_FlowOut[r, p, s, d, S_i, t, v, S_o])
+        coefs.append(value(M.EmissionActivity[r, e, S_i, t, v, S_o]))
+    for S_i, S_o in M.processIOPairs[r, p, linked_t, v]:
+        flows.append(M.V_FlowOut[r, p, s, d, S_i, linked_t, v, S_o])
+        coefs.append(1)
+
+    return LinearExpression(constant=0, linear_coefs=coefs, linear_vars=flows) == 0
@@ -26,9 +26,16 @@ Created on:  3/1/24
 
 """
 
+import numpy as np
 import pytest
 
 from temoa.temoa_model.table_data_puller import loan_costs
+from temoa.temoa_model.temoa_rules import (
+    fixed_or_variable_cost,
+    fixed_or_variable_cost_coefficients,
+    loan_cost,
+    loan_cost_coefficients,
+)
 
 params = [
     {
@@ -100,3 +107,47 @@ def test_loan_costs_with_zero_GDR(param):
     model_cost, undiscounted_cost = loan_costs(**param)
     assert model_cost == pytest.approx(param['model_cost'], abs=0.01)
     assert undiscounted_cost == pytest.approx(param['undiscounted_cost'], abs=0.01)
+
+
+@pytest.mark.parametrize(
+    'param',
+    params + params_with_zero_GDR,
+    ids=(param['ID'] for param in params + params_with_zero_GDR),
+)
+def test_cost_coefficients_match_cost_functions(param):
+    """
+    The objective uses the vectorized cost coefficients while the reporting uses the scalar
+    cost functions.  Make sure they agree.
+    """
+    GDR = param['global_discount_rate']
+    loan_coefs = loan_cost_coefficients(
+        invest_cost=np.array([param['invest_cost'], 2 * param['invest_cost']], dtype=float),
+        loan_annualize=np.array([0.1, 0.1]),
+        lifetime_loan_process=np.array([param['loan_life'], param['loan_life'] // 2], dtype=float),
+        P_0=param['p_0'],
+        P_e=param['p_e'],
+        GDR=GDR,
+        vintage=param['vintage'],
+    )
+    for coef, invest_cost, loan_life in zip(
+        loan_coefs,
+        (param['invest_cost'], 2 * param['invest_cost']),
+        (param['loan_life'], param['loan_life'] // 2),
+        strict=True,
+    ):
+        expected = loan_cost(
+            1, invest_cost, 0.1, loan_life, param['p_0'], param['p_e'], GDR, param['vintage']
+        )
+        assert coef == pytest.approx(expected)
+
+    fixed_coefs = fixed_or_variable_cost_coefficients(
+        cost_factor=np.array([param['invest_cost']], dtype=float),
+        process_lifetime=np.array([param['process_life']], dtype=float),
+        GDR=GDR,
+        P_0=param['p_0'],
+        p=param['vintage'],
+    )
+    expected = fixed_or_variable_cost(
+        1, param['invest_cost'], param['process_life'], GDR, param['p_0'], param['vintage']
+    )
+    assert fixed_coefs[0] == pytest.approx(expected)